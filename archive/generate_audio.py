@@ -5,33 +5,22 @@
 import json
 import os
 import ssl
+import sys
 import time
 from pathlib import Path
 from openai import OpenAI
 from dotenv import load_dotenv
 import certifi
 
+# Share the filename rules with the current generator and the web app
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from filenames import sanitize_filename
+from http_client import create_http_client
+
 # Fix SSL certificate verification issue on macOS
 os.environ['SSL_CERT_FILE'] = certifi.where()
 os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
 
-def sanitize_filename(word):
-    """
-    Convert word to filename format matching the JavaScript implementation.
-    """
-    return (word
-        .lower()
-        .replace(' ', '_')
-        .replace("'", '')
-        .replace("'", '')
-        .replace('à', 'a').replace('â', 'a').replace('ä', 'a')
-        .replace('é', 'e').replace('è', 'e').replace('ê', 'e').replace('ë', 'e')
-        .replace('î', 'i').replace('ï', 'i')
-        .replace('ô', 'o').replace('ö', 'o')
-        .replace('ù', 'u').replace('û', 'u').replace('ü', 'u')
-        .translate(str.maketrans('', '', ''.join(c for c in '!"#$%&()*+,-./:;<=>?@[\\]^`{|}~' if c not in '_')))
-    )
-
 def generate_audio_files(api_key, force_regenerate=False):
     """
     Generate audio pronunciation files for all words in words.json.
@@ -40,10 +29,8 @@ def generate_audio_files(api_key, force_regenerate=False):
         api_key: OpenAI API key
         force_regenerate: If True, regenerate all files. If False, skip existing files.
     """
-    # Initialize OpenAI client with SSL workaround for macOS
-    # Python 3.13+ on macOS has SSL certificate verification issues
-    import httpx
-    http_client = httpx.Client(verify=False)
+    # Same verified, keep-alive client as the multi-level generator (one request at a time here)
+    http_client = create_http_client(concurrency=1)
     client = OpenAI(api_key=api_key, http_client=http_client)
 
     # Load words from JSON
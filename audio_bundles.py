@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# ABOUTME: Packs each level's MP3s into one content-hashed bundle with a byte-range index
+# ABOUTME: Lets the web app fetch a whole level in one request and play words from memory
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from filenames import sanitize_filename
+
+BUNDLE_MANIFEST_VERSION = 1
+
+
+def load_bundle_manifest(bundle_dir):
+    path = bundle_dir / 'manifest.json'
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == BUNDLE_MANIFEST_VERSION:
+            return manifest
+    return {"version": BUNDLE_MANIFEST_VERSION, "levels": {}}
+
+
+def save_bundle_manifest(manifest, bundle_dir):
+    """Write the bundle manifest atomically."""
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    path = bundle_dir / 'manifest.json'
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def level_fingerprint(words, audio_dir):
+    """
+    Identify the exact audio a level bundle would contain.
+
+    Hashes each file's content, so the fingerprint is the same in every
+    checkout whatever the files' mtimes or the state of the audio cache,
+    and post-processed or replaced files are still noticed.
+    """
+    digest = hashlib.sha256()
+    hashes = {}
+    for word in words:
+        filename = sanitize_filename(word)
+        if filename not in hashes:
+            try:
+                data = (audio_dir / f"{filename}.mp3").read_bytes()
+                hashes[filename] = f"{hashlib.sha256(data).hexdigest()}:{len(data)}"
+            except FileNotFoundError:
+                hashes[filename] = 'missing'
+        digest.update(f"{filename}\0{hashes[filename]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_level_bundle(level, words, audio_dir, bundle_dir, manifest):
+    """
+    Concatenate a level's MP3s into `bundle_dir/<level>.<hash>.mp3`.
+
+    Every word's bytes are a complete MP3 file, so any slice given by the
+    index plays on its own. Words without audio get a (0, 0) range and
+    the app falls back to the individual file.
+
+    Args:
+        level: Bee level name
+        words: Words in display order
+        audio_dir: Directory holding the level's MP3s
+        bundle_dir: Output directory for bundles
+        manifest: Bundle manifest from load_bundle_manifest (updated in place)
+
+    Returns:
+        True if the bundle was rebuilt, False if it was already current.
+    """
+    fingerprint = level_fingerprint(words, audio_dir)
+    previous = manifest['levels'].get(level)
+    if (previous and previous['fingerprint'] == fingerprint
+            and (bundle_dir.parent / previous['file']).exists()):
+        return False
+
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = bundle_dir / f"{level}.bundle.tmp"
+    digest = hashlib.sha256()
+    offsets = {}
+    ranges = []
+    size = 0
+
+    with open(tmp_path, 'wb') as out:
+        for word in words:
+            filename = sanitize_filename(word)
+            if filename not in offsets:
+                path = audio_dir / f"{filename}.mp3"
+                if path.exists():
+                    data = path.read_bytes()
+                    out.write(data)
+                    digest.update(data)
+                    offsets[filename] = (size, len(data))
+                    size += len(data)
+                else:
+                    offsets[filename] = (0, 0)
+            ranges.extend(offsets[filename])
+
+    bundle_path = bundle_dir / f"{level}.{digest.hexdigest()[:12]}.mp3"
+    os.replace(tmp_path, bundle_path)
+
+    if previous and previous['file'] != bundle_path.relative_to(bundle_dir.parent).as_posix():
+        stale = bundle_dir.parent / previous['file']
+        if stale.exists():
+            stale.unlink()
+
+    manifest['levels'][level] = {
+        "fingerprint": fingerprint,
+        "file": bundle_path.relative_to(bundle_dir.parent).as_posix(),
+        "size": size,
+        "ranges": ranges,
+    }
+    return True
+
+
+def bundle_index(manifest, audio_root_name='audio'):
+    """Per-level bundle URL and ranges for embedding in the word index."""
+    return {
+        level: {"url": f"{audio_root_name}/{entry['file']}", "ranges": entry['ranges']}
+        for level, entry in manifest['levels'].items()
+    }
+
+
+def main():
+    """Rebuild bundles from the existing audio and refresh the word index."""
+    from levels import load_levels
+    from word_index import read_words_json, write_word_index
+
+    project_root = Path(__file__).parent
+    bundle_dir = project_root / 'audio' / 'bundles'
+    manifest = load_bundle_manifest(bundle_dir)
+    configs = load_levels(project_root)
+
+    for config in configs:
+        level = config['level']
+        rebuilt = build_level_bundle(level, read_words_json(config['json_file']), config['audio_dir'],
+                                     bundle_dir, manifest)
+        entry = manifest['levels'][level]
+        status = "rebuilt" if rebuilt else "up to date"
+        print(f"{level}: {entry['file']} ({entry['size'] / 1024:.0f} KB) {status}")
+    save_bundle_manifest(manifest, bundle_dir)
+
+    index_path = write_word_index(configs, project_root / 'data', project_root / 'index.html',
+                                  bundles=bundle_index(manifest))
+    print(f"Wrote {index_path.relative_to(project_root)}")
+
+
+if __name__ == '__main__':
+    main()
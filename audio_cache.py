@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# ABOUTME: Content-addressed blob store for synthesized audio, keyed by word and TTS parameters
+# ABOUTME: A JSON manifest maps each level/word to its blob; level files are hardlinks into the store
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def normalize_word(word):
+    """Canonical form used for cache keys: NFC, collapsed whitespace, casefolded."""
+    return unicodedata.normalize('NFC', ' '.join(word.split())).casefold()
+
+
+def cache_key(word, params, override=None):
+    """
+    Hash a word together with every parameter that affects the audio.
+
+    Args:
+        word: Word or phrase as it appears in the source list
+        params: Dict of TTS request parameters (model, voice, response_format, ...)
+        override: The word's pronunciation override, if any (see pronunciations);
+                  words without one keep the key they had before overrides existed
+    """
+    payload = {"word": normalize_word(word), "params": params}
+    if override:
+        payload["override"] = override
+    payload = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """
+    Blob store under `root/blobs/<xx>/<key>.<format>` plus `root/manifest.json`.
+
+    The manifest has two sections:
+        blobs:  key -> {"word", "params", "size"}
+        levels: level -> {filename -> key}
+
+    Levels are built in parallel against one cache, so every method that
+    touches the manifest holds a lock, and claim/release make sure each key
+    is synthesized by exactly one level at a time.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.manifest_path = self.root / 'manifest.json'
+        self.manifest = self._load()
+        self.failures = Counter()   # level -> words whose synthesis failed this run
+        self._lock = threading.RLock()
+        self._in_flight = {}
+        self._fresh = set()
+
+    def _load(self):
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        return {"version": MANIFEST_VERSION, "blobs": {}, "levels": {}}
+
+    def save(self):
+        """Write the manifest atomically."""
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+
+    def blob_path(self, key, params):
+        ext = params.get('response_format', 'mp3')
+        return self.blob_dir / key[:2] / f"{key}.{ext}"
+
+    def has_blob(self, key, params):
+        return key in self.manifest['blobs'] and self.blob_path(key, params).exists()
+
+    def level_entry(self, level, filename):
+        with self._lock:
+            return self.manifest['levels'].get(level, {}).get(filename)
+
+    def add_blob(self, key, word, params):
+        """Record a blob that has just been written to `blob_path(key, params)`."""
+        path = self.blob_path(key, params)
+        with self._lock:
+            self.manifest['blobs'][key] = {
+                "word": word,
+                "params": params,
+                "size": path.stat().st_size,
+            }
+
+    def adopt(self, key, word, params, existing_path):
+        """Import a file generated before the cache existed as the blob for `key`."""
+        path = self.blob_path(key, params)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(existing_path, path)
+            self.add_blob(key, word, params)
+
+    def materialize(self, level, filename, key, params, target):
+        """Point `target` at the blob for `key` and record the mapping."""
+        blob = self.blob_path(key, params)
+        if not (target.exists() and os.path.samefile(target, blob)):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(target.name + '.link')
+            _link_or_copy(blob, tmp_path)
+            os.replace(tmp_path, target)
+        with self._lock:
+            self.manifest['levels'].setdefault(level, {})[filename] = key
+
+    def forget(self, level, filename):
+        """Drop a level's mapping for a word that left the list; the blob is kept."""
+        with self._lock:
+            self.manifest['levels'].get(level, {}).pop(filename, None)
+
+    def claim(self, key, params, target, job, reuse=True):
+        """
+        Register `job` as the synthesis of `key`, or join the one in flight.
+
+        `target` is a (level, filename, path) tuple appended to the job's
+        targets; whichever level owns the job materializes all of them.
+
+        Args:
+            reuse: Treat an existing blob as done (False when forcing regeneration)
+
+        Returns:
+            The in-flight job (`job` itself when the caller now owns it), or
+            None when the blob is already available to materialize.
+        """
+        with self._lock:
+            if key in self._fresh or (reuse and self.has_blob(key, params)):
+                return None
+            running = self._in_flight.setdefault(key, job)
+            running['targets'].append(target)
+            return running
+
+    def release(self, key, ok):
+        """
+        Finish an in-flight job and return its targets.
+
+        Call after add_blob on success; failed targets are counted per level
+        in `failures`.
+        """
+        with self._lock:
+            targets = self._in_flight.pop(key)['targets']
+            if ok:
+                self._fresh.add(key)
+            else:
+                for level, _, _ in targets:
+                    self.mark_failed(level)
+            return targets
+
+    def mark_failed(self, level):
+        """Count a word of `level` that has no audio after this run."""
+        with self._lock:
+            self.failures[level] += 1
+
+
+def _link_or_copy(src, dst):
+    """Hardlink `src` to `dst`, falling back to a copy across filesystems."""
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# ABOUTME: Batched multi-word TTS requests split back into per-word MP3s by silence detection
+# ABOUTME: Falls back to single-word requests whenever the split does not match the batch size
+
+import os
+import shutil
+import subprocess
+import sys
+from array import array
+
+from metrics import console
+from tts_engine import partial_path, synthesize_word
+
+# OpenAI's "pcm" response format: raw 24 kHz signed 16-bit little-endian mono
+PCM_SAMPLE_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+
+BATCH_INSTRUCTIONS = (
+    "Read each word in the list on its own, clearly and at a steady pace. "
+    "Leave a full one second pause of silence between words."
+)
+
+WINDOW_MS = 10
+SILENCE_THRESHOLD = 600       # peak amplitude below which a window counts as silent
+MIN_GAP_MS = 350              # silence run long enough to separate two words
+MIN_WORD_MS = 80              # anything shorter is treated as noise
+EDGE_PAD_MS = 60              # silence kept around each word
+MP3_BITRATE = '128k'          # what the API returns for mp3 (24 kHz mono), so split
+                              # words share a cache key with single-request audio
+
+
+def find_ffmpeg():
+    """Return the ffmpeg executable path, or None when it is not installed."""
+    return shutil.which('ffmpeg')
+
+
+def split_on_silence(pcm, sample_rate=PCM_SAMPLE_RATE):
+    """
+    Find spoken segments in 16-bit mono PCM.
+
+    Returns:
+        List of (start, end) sample offsets, one per run of sound separated
+        by at least MIN_GAP_MS of silence.
+    """
+    samples = array('h')
+    samples.frombytes(pcm[:len(pcm) - len(pcm) % PCM_SAMPLE_WIDTH])
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    window = sample_rate * WINDOW_MS // 1000
+    min_gap = MIN_GAP_MS // WINDOW_MS
+    min_word = MIN_WORD_MS // WINDOW_MS
+    pad = sample_rate * EDGE_PAD_MS // 1000
+
+    loud = [
+        max(max(samples[i:i + window]), -min(samples[i:i + window])) >= SILENCE_THRESHOLD
+        for i in range(0, len(samples), window)
+    ]
+
+    segments = []
+    start = None
+    quiet = 0
+    for idx, is_loud in enumerate(loud):
+        if is_loud:
+            if start is None:
+                start = idx
+            quiet = 0
+        elif start is not None:
+            quiet += 1
+            if quiet >= min_gap:
+                segments.append((start, idx - quiet + 1))
+                start = None
+                quiet = 0
+    if start is not None:
+        segments.append((start, len(loud) - quiet))
+
+    return [
+        (max(0, s * window - pad), min(len(samples), e * window + pad))
+        for s, e in segments
+        if e - s >= min_word
+    ]
+
+
+def encode_mp3(pcm, output_path, ffmpeg, sample_rate=PCM_SAMPLE_RATE):
+    """Encode 16-bit mono PCM to an MP3 file with ffmpeg, renaming it into place when done."""
+    part_path = partial_path(output_path)
+    try:
+        subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+             '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+             '-codec:a', 'libmp3lame', '-b:a', MP3_BITRATE, '-f', 'mp3', str(part_path)],
+            input=pcm, check=True
+        )
+        os.replace(part_path, output_path)
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+
+
+def synthesize_batch(client, jobs, limiter, params, ffmpeg, scratch_dir):
+    """
+    Synthesize several words with one TTS request and split the result.
+
+    Args:
+        client: OpenAI client instance
+        jobs: Job dicts with 'word', 'blob_path', 'label' and optionally 'span'
+        limiter: Shared TokenBucket
+        params: TTS request parameters for single-word output
+        ffmpeg: Path to the ffmpeg executable
+        scratch_dir: Directory for the raw PCM response
+
+    Returns:
+        List of per-job errors (None on success), in job order.
+    """
+    words = [job['word'] for job in jobs]
+    label = f"{jobs[0]['label']} [batch of {len(jobs)}]"
+    batch_params = dict(params, response_format='pcm', instructions=BATCH_INSTRUCTIONS)
+    pcm_path = scratch_dir / f"{jobs[0]['key']}.pcm"
+
+    scratch_dir.mkdir(parents=True, exist_ok=True)
+    # Every word of the batch shares the one request's timings
+    batch_span = {}
+    error = synthesize_word(client, '\n\n'.join(f"{word}." for word in words),
+                            pcm_path, limiter, label, params=batch_params, span=batch_span)
+    for job in jobs:
+        if 'span' in job:
+            job['span'].update(batch_span)
+
+    segments = []
+    if error is None:
+        pcm = pcm_path.read_bytes()
+        segments = split_on_silence(pcm)
+        pcm_path.unlink()
+
+    # Quality gate: one segment per word, otherwise fall back to single requests
+    if error is not None or len(segments) != len(jobs):
+        if error is None:
+            console.info(f"{label} ✂️  Split found {len(segments)} segments for {len(jobs)} words, "
+                         f"falling back to single-word requests")
+        return [
+            synthesize_word(client, job['word'], job['blob_path'], limiter, job['label'],
+                            params=params, span=job.get('span'))
+            for job in jobs
+        ]
+
+    results = []
+    for job, (start, end) in zip(jobs, segments):
+        try:
+            encode_mp3(pcm[start * PCM_SAMPLE_WIDTH:end * PCM_SAMPLE_WIDTH],
+                       job['blob_path'], ffmpeg)
+            results.append(None)
+        except (OSError, subprocess.CalledProcessError) as e:
+            results.append(e)
+    return results
+
+
+def batched(jobs, size, key=None):
+    """
+    Group an iterable of jobs into lists of at most `size`.
+
+    With `key`, only jobs with equal keys (e.g. the same TTS parameters)
+    share a batch; each key fills its own.
+    """
+    batches = {}
+    for job in jobs:
+        group = key(job) if key else None
+        batch = batches.setdefault(group, [])
+        batch.append(job)
+        if len(batch) == size:
+            yield batches.pop(group)
+    yield from (batch for batch in batches.values() if batch)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# ABOUTME: Benchmarks word-list ingestion on large synthetic inputs (default 1M lines)
+# ABOUTME: Reports peak RSS, throughput and time-to-first-word for streaming vs list-based paths
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+MODES = ('stream', 'stream-raw', 'list')
+
+
+def write_synthetic_list(path, lines, duplicate_every=10):
+    """Write `lines` pseudo-words, repeating an earlier one every `duplicate_every` lines."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            n = i // 2 if duplicate_every and i % duplicate_every == 0 else i
+            f.write(f"word{n:07d}\n")
+            if i % 1000 == 999:
+                f.write("\n")
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_mode(mode, source, output):
+    """Run one ingestion mode in this process and return its measurements."""
+    from generate_all_audio import (
+        create_words_json,
+        iter_unique_words,
+        iter_word_file,
+        parse_word_file,
+        write_words_json_stream,
+    )
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    first_word = None
+    count = 0
+
+    if mode.startswith('stream'):
+        words = iter_word_file(source)
+        if mode == 'stream':
+            words = iter_unique_words(words)
+        for _ in write_words_json_stream(words, output):
+            # Stand-in for the synthesis queue consuming each word
+            if first_word is None:
+                first_word = time.perf_counter() - start
+            count += 1
+    else:
+        words_data = create_words_json(parse_word_file(source), output)
+        for _ in words_data['words']:
+            if first_word is None:
+                first_word = time.perf_counter() - start
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "words": count,
+        "seconds": elapsed,
+        "words_per_second": count / elapsed if elapsed else None,
+        "first_word_seconds": first_word,
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming word-list ingestion")
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES,
+                        help="stream-raw skips de-duplication, whose filename set is the only "
+                             "state that grows with input size")
+    parser.add_argument('--json', type=Path, help="also write results to this file")
+    parser.add_argument('--run-mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--source', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process: measure one mode so peak RSS is not shared between modes
+    if args.run_mode:
+        result = run_mode(args.run_mode, args.source, args.source.with_suffix('.json'))
+        print(json.dumps(result))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'words.txt'
+        print(f"Writing {args.lines:,} synthetic lines...")
+        write_synthetic_list(source, args.lines)
+
+        for mode in args.modes:
+            proc = subprocess.run(
+                [sys.executable, __file__, '--run-mode', mode, '--source', str(source)],
+                capture_output=True, text=True, check=True
+            )
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{'='*70}")
+    print(f"{'mode':<10} {'words':>10} {'seconds':>9} {'words/s':>11} {'first word':>11} {'peak RSS':>10}")
+    for r in results:
+        growth = r['peak_rss_mb'] - r['baseline_rss_mb']
+        print(f"{r['mode']:<10} {r['words']:>10,} {r['seconds']:>9.2f} {r['words_per_second']:>11,.0f} "
+              f"{r['first_word_seconds'] * 1000:>9.1f}ms {r['peak_rss_mb']:>7.0f} MB (+{growth:.0f})")
+    print(f"{'='*70}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"lines": args.lines, "results": results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
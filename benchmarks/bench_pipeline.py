@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# ABOUTME: Benchmarks the generation pipeline (synthesis, parsing, JSON writing, filename sanitizing)
+# ABOUTME: Reports throughput, per-word latency percentiles, peak RSS and stat/syscall counts as JSON
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_ingest import peak_rss_mb
+
+BENCHMARKS = ('sanitize', 'parse', 'create_json', 'generate')
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def synthetic_words(count):
+    """Real list words (accents, spaces, apostrophes) made unique with a numeric suffix."""
+    base = []
+    for source in sorted(PROJECT_ROOT.glob('schoolBee_*.txt')):
+        base.extend(line.strip() for line in source.read_text(encoding='utf-8').splitlines()
+                    if line.strip())
+    return [f"{base[i % len(base)]} {i}" for i in range(count)]
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": samples[-1]}
+
+
+class StatCounter:
+    """Counts os.stat calls (Path.exists/stat/is_file all go through it) while active."""
+
+    def __init__(self):
+        self.count = 0
+        self._original = os.stat
+
+    def __enter__(self):
+        def counting_stat(*args, **kwargs):
+            self.count += 1
+            return self._original(*args, **kwargs)
+        os.stat = counting_stat
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._original
+
+
+def io_syscalls():
+    """Read/write syscall counters from /proc (Linux only)."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return {"read": int(fields['syscr']), "write": int(fields['syscw'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# Each prepare_* function does imports and setup, then returns the timed callable.
+# The callable returns per-word latencies in seconds, or None when not meaningful.
+
+def prepare_sanitize(words, options, tmp):
+    from filenames import sanitize_filename
+
+    def run():
+        latencies = []
+        clock = time.perf_counter
+        for word in words:
+            start = clock()
+            sanitize_filename(word)
+            latencies.append(clock() - start)
+        return latencies
+    return run
+
+
+def prepare_parse(words, options, tmp):
+    from generate_all_audio import parse_word_file
+    source = tmp / 'words.txt'
+    source.write_text('\n'.join(words) + '\n', encoding='utf-8')
+    return lambda: parse_word_file(source) and None
+
+
+def prepare_create_json(words, options, tmp):
+    from generate_all_audio import create_words_json
+    return lambda: create_words_json(words, tmp / 'words.json') and None
+
+
+def start_mock_process(options):
+    """
+    Run the mock TTS server in its own process so its request handling does
+    not compete with the generator for the GIL.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / 'mock_tts_server.py'), '--port', '0',
+         '--latency', str(options['latency']), '--jitter', str(options['jitter']),
+         '--error-rate', str(options['error_rate']),
+         '--payload-bytes', str(options['payload_bytes'])],
+        stdout=subprocess.PIPE, text=True
+    )
+    base_url = proc.stdout.readline().split()[-1]
+    return proc, base_url
+
+
+def prepare_generate(words, options, tmp):
+    from openai import OpenAI
+
+    from generate_all_audio import TTS_PARAMS, generate_audio_for_bee
+    from http_client import create_http_client
+    from metrics import QUIET, BuildMetrics, console
+    from tts_backends import OpenAIBackend
+    from tts_engine import TokenBucket
+
+    server, base_url = start_mock_process(options)
+    http_client = create_http_client(options['concurrency'])
+    client = OpenAI(api_key="mock", base_url=base_url, http_client=http_client, max_retries=0)
+    backend = OpenAIBackend(TTS_PARAMS, client)
+    metrics = BuildMetrics()
+    # Per-word lines would dominate the measurement
+    console.verbosity = QUIET
+
+    def run():
+        word_objs = ({"id": i + 1, "word": word} for i, word in enumerate(words))
+        try:
+            generate_audio_for_bee(backend, 'XB', word_objs, tmp / 'audio' / 'XB',
+                                   concurrency=options['concurrency'],
+                                   limiter=TokenBucket(rate=1e9), total=len(words),
+                                   metrics=metrics)
+        finally:
+            http_client.close()
+            server.terminate()
+            server.wait()
+        return metrics.phases['total']
+    return run
+
+
+RUNNERS = {
+    'sanitize': prepare_sanitize,
+    'parse': prepare_parse,
+    'create_json': prepare_create_json,
+    'generate': prepare_generate,
+}
+
+
+def run_benchmark(name, size, options):
+    """Run one benchmark in this process and return its measurements."""
+    words = synthetic_words(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        run = RUNNERS[name](words, options, Path(tmp))
+        baseline = peak_rss_mb()
+        io_before = io_syscalls()
+        with StatCounter() as stats:
+            start = time.perf_counter()
+            latencies = run()
+            elapsed = time.perf_counter() - start
+        io_after = io_syscalls()
+
+    return {
+        "benchmark": name,
+        "words": size,
+        "seconds": elapsed,
+        "words_per_second": size / elapsed if elapsed else None,
+        "latency": percentiles(latencies),
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak_rss_mb(),
+        "stat_calls": stats.count,
+        "io_syscalls": ({key: io_after[key] - io_before[key] for key in io_after}
+                        if io_before and io_after else None),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    previous = {}
+    if baseline:
+        previous = {(r['benchmark'], r['words']): r for r in baseline['results']}
+
+    print(f"\n{'='*96}")
+    print(f"{'benchmark':<12} {'words':>8} {'seconds':>8} {'words/s':>11} {'p50':>9} {'p95':>9} "
+          f"{'p99':>9} {'peak RSS':>9} {'stats':>8}  vs base")
+    for r in results:
+        latency = r['latency'] or {}
+        fmt = lambda key: f"{latency[key] * 1e6:7.1f}us" if key in latency else f"{'-':>9}"
+        change = ''
+        old = previous.get((r['benchmark'], r['words']))
+        if old and old['words_per_second'] and r['words_per_second']:
+            change = f"{100 * (r['words_per_second'] / old['words_per_second'] - 1):+.0f}%"
+        print(f"{r['benchmark']:<12} {r['words']:>8,} {r['seconds']:>8.2f} "
+              f"{r['words_per_second']:>11,.0f} {fmt('p50')} {fmt('p95')} {fmt('p99')} "
+              f"{r['peak_rss_mb']:>6.0f} MB {r['stat_calls']:>8,}  {change}")
+    print(f"{'='*96}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the audio generation pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=BENCHMARKS)
+    parser.add_argument('-j', '--concurrency', type=int, default=32,
+                        help="synthesis workers for the generate benchmark")
+    parser.add_argument('--latency', type=float, default=0.005, help="mock TTS latency (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="fraction of mock requests failing with a 500")
+    parser.add_argument('--payload-bytes', type=int, default=8_000,
+                        help="mock MP3 response size")
+    parser.add_argument('--json', type=Path, help="write results to this file")
+    parser.add_argument('--compare', type=Path, help="earlier --json output to compare against")
+    parser.add_argument('--run', nargs=2, metavar=('BENCHMARK', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    options = {
+        "concurrency": args.concurrency,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "payload_bytes": args.payload_bytes,
+    }
+
+    # Child process: one benchmark per process so peak RSS is not shared
+    if args.run:
+        print(json.dumps(run_benchmark(args.run[0], int(args.run[1]), options)))
+        return
+
+    child_options = ['-j', str(args.concurrency), '--latency', str(args.latency),
+                     '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+                     '--payload-bytes', str(args.payload_bytes)]
+    results = []
+    for name in args.benchmarks:
+        for size in args.sizes:
+            print(f"Running {name} at {size:,} words...", flush=True)
+            proc = subprocess.run(
+                [sys.executable, __file__, '--run', name, str(size), *child_options],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    if args.json:
+        report = {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": options,
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
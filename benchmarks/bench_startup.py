@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# ABOUTME: Measures the import cost of each offline spellingbee subcommand with python -X importtime
+# ABOUTME: Fails when a command exceeds the startup budget or pulls in the network stack (openai, httpx, ssl)
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+BUDGET_MS = 100.0
+RUNS = 5
+
+# Subcommands that never talk to the TTS API, with the arguments selecting their module
+OFFLINE_COMMANDS = {
+    'plan': [],
+    'verify': [],
+    'verify --audio': ['--audio'],
+}
+
+# Only `build` may import these, and only once a level needs the API
+NETWORK_MODULES = ('openai', 'httpx', 'httpcore', 'h2', 'ssl', 'certifi', 'dotenv')
+
+
+def import_profile(command, args):
+    """
+    Import the CLI and the module behind `command` in a fresh interpreter.
+
+    Returns:
+        (milliseconds, modules): cumulative import time of everything
+        imported after interpreter startup, and the names of those modules.
+    """
+    code = (f"from spellingbee.cli import load_command; "
+            f"load_command({command.split()[0]!r}, {args!r})")
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+
+    # Lines read "import time: self | cumulative | name", nested imports indented.
+    # Everything up to `site` is interpreter startup, common to every Python program.
+    lines = [line for line in proc.stderr.splitlines() if line.startswith('import time:')]
+    names = [line.split('|')[2].rstrip() for line in lines]
+    start = next((i + 1 for i, name in enumerate(names) if name == ' site'), 0)
+
+    # Top-level entries' cumulative times already include their nested imports
+    total_us = sum(int(line.split('|')[1]) for line, name in zip(lines[start:], names[start:])
+                   if not name.startswith('  '))
+    return total_us / 1000, [name.strip() for name in names[start:]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the startup cost of offline subcommands")
+    parser.add_argument('--budget', type=float, default=BUDGET_MS,
+                        help=f"maximum import time per command in ms (default: {BUDGET_MS:g})")
+    parser.add_argument('--runs', type=int, default=RUNS,
+                        help=f"interpreters per command; the fastest counts (default: {RUNS})")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for command, command_args in OFFLINE_COMMANDS.items():
+        # The fastest run is the least disturbed by the rest of the machine
+        profiles = [import_profile(command, command_args) for _ in range(args.runs)]
+        ms, modules = min(profiles)
+        network = sorted({name.split('.')[0] for name in modules} & set(NETWORK_MODULES))
+        results.append({
+            "command": command,
+            "import_ms": round(ms, 1),
+            "modules": len(modules),
+            "network_modules": network,
+            "ok": ms <= args.budget and not network,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'command':<16} {'import':>9} {'modules':>8}  network stack")
+        for r in results:
+            print(f"{r['command']:<16} {r['import_ms']:>7.1f}ms {r['modules']:>8}  "
+                  f"{', '.join(r['network_modules']) or '-'}"
+                  + ("" if r['ok'] else "  ❌"))
+        print(f"Budget: {args.budget:g}ms per command")
+
+    sys.exit(0 if all(r['ok'] for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# ABOUTME: Runs generate_audio_for_bee against the local mock TTS server
+# ABOUTME: Checks skip/generated/failed stats and reports wall time under latency and 429s
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openai import OpenAI
+
+from generate_all_audio import TTS_PARAMS, generate_audio_for_bee
+from http_client import RequestTimings, create_http_client
+from mock_tts_server import start_server
+from tts_backends import OpenAIBackend
+from tts_engine import TokenBucket
+
+
+def make_certificate(directory):
+    """Self-signed certificate for 127.0.0.1, used as both server cert and CA bundle."""
+    cert, key = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+         '-keyout', str(key), '-out', str(cert)],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+def run(words=200, concurrency=8, rate=50.0, latency=0.1, rate_limit_every=25, retry_after=0.5,
+        tls=False):
+    tls_dir = tempfile.TemporaryDirectory()
+    cert = key = None
+    if tls:
+        cert, key = make_certificate(Path(tls_dir.name))
+    server = start_server(latency=latency, rate_limit_every=rate_limit_every, retry_after=retry_after,
+                          certfile=cert, keyfile=key)
+    timings = RequestTimings()
+    http_client = create_http_client(concurrency, ca_bundle=cert, timings=timings)
+    client = OpenAI(api_key="mock", base_url=server.base_url, http_client=http_client, max_retries=0)
+    backend = OpenAIBackend(TTS_PARAMS, client)
+    word_objs = [{"id": i + 1, "word": f"word{i}"} for i in range(words)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_dir = Path(tmp) / 'audio' / 'XB'
+        limiter = TokenBucket(rate=rate)
+
+        start = time.perf_counter()
+        first = generate_audio_for_bee(backend, 'XB', word_objs, audio_dir,
+                                       concurrency=concurrency, limiter=limiter)
+        elapsed = time.perf_counter() - start
+
+        # A second pass must skip everything without touching the network
+        requests_before = server.stats["requests"]
+        second = generate_audio_for_bee(backend, 'XB', word_objs, audio_dir,
+                                        concurrency=concurrency, limiter=limiter)
+        written = len(list(audio_dir.glob('*.mp3')))
+
+    server.shutdown()
+    http_client.close()
+    tls_dir.cleanup()
+
+    ok = (first == {"generated": words, "skipped": 0, "failed": 0}
+          and second == {"generated": 0, "skipped": words, "failed": 0}
+          and server.stats["requests"] == requests_before
+          and written == words)
+
+    print(f"\n{'='*70}")
+    print(f"Words: {words}  concurrency: {concurrency}  latency: {latency}s  "
+          f"{'HTTPS' if tls else 'HTTP'}")
+    print(f"Server: {server.stats}")
+    timings.print_summary()
+    print(f"Wall time: {elapsed:.2f}s ({words / elapsed:.1f} words/s)")
+    print(f"Serial estimate: {words * (latency + 0.5):.1f}s")
+    print(f"Result: {'PASS' if ok else 'FAIL'}")
+    print(f"{'='*70}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise the TTS engine against a mock server")
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('-j', '--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=50.0)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--rate-limit-every', type=int, default=25)
+    parser.add_argument('--retry-after', type=float, default=0.5)
+    parser.add_argument('--tls', action='store_true',
+                        help="serve HTTPS with a throwaway self-signed certificate (needs openssl)")
+    args = parser.parse_args()
+
+    ok = run(args.words, args.concurrency, args.rate, args.latency,
+             args.rate_limit_every, args.retry_after, tls=args.tls)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# ABOUTME: Local stand-in for the OpenAI speech endpoint used to exercise the generator offline
+# ABOUTME: Injects latency, jitter, server errors and periodic 429s with Retry-After, over HTTP or HTTPS
+
+import argparse
+import itertools
+import random
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, mono, 417 bytes)
+SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC4]) + bytes(413)
+
+
+class MockTTSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.05, rate_limit_every=0, retry_after=1.0, frames=20,
+                 certfile=None, keyfile=None, jitter=0.0, error_rate=0.0, payload_bytes=None,
+                 seed=0):
+        super().__init__(address, MockTTSHandler)
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+            self.scheme = 'https'
+
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.jitter = jitter
+        self.error_rate = error_rate
+        if payload_bytes is not None:
+            frames = max(1, payload_bytes // len(SILENT_MP3_FRAME))
+        self.payload = SILENT_MP3_FRAME * frames
+        self._counter = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+
+    def next_request(self):
+        """
+        Decide how to answer the next request.
+
+        Returns:
+            (outcome, delay) where outcome is "ok", "rate_limited" or "error".
+        """
+        with self._lock:
+            n = next(self._counter)
+            self.stats["requests"] += 1
+            if self.rate_limit_every and n % self.rate_limit_every == 0:
+                outcome = "rate_limited"
+            elif self.error_rate and self._random.random() < self.error_rate:
+                outcome = "error"
+            else:
+                outcome = "ok"
+            self.stats["errors" if outcome == "error" else outcome] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            return outcome, delay
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"{self.scheme}://{host}:{port}/v1"
+
+
+class MockTTSHandler(BaseHTTPRequestHandler):
+    # Keep connections open like the real API so client pooling is exercised
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without this, delayed ACKs add ~40ms per response
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+
+        if not self.path.endswith('/audio/speech'):
+            self.send_error(404)
+            return
+
+        server = self.server
+        outcome, delay = server.next_request()
+        if outcome == "rate_limited":
+            body = b'{"error": {"message": "Rate limit reached", "type": "requests"}}'
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Retry-After', f"{server.retry_after:g}")
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        time.sleep(delay)
+        if outcome == "error":
+            body = b'{"error": {"message": "Mock server error", "type": "server_error"}}'
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('Content-Length', str(len(server.payload)))
+        self.end_headers()
+        self.wfile.write(server.payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host='127.0.0.1', port=0, **options):
+    """Start a MockTTSServer on a background thread and return it."""
+    server = MockTTSServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI TTS endpoint")
+    parser.add_argument('--port', type=int, default=8765, help="0 picks a free port")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds per request")
+    parser.add_argument('--rate-limit-every', type=int, default=0,
+                        help="answer every Nth request with 429 (0 disables)")
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="extra random latency, uniform in [0, JITTER] seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="fraction of requests answered with a 500")
+    parser.add_argument('--payload-bytes', type=int, default=None,
+                        help="approximate MP3 response size (default: 20 frames)")
+    parser.add_argument('--certfile', help="serve HTTPS with this certificate (PEM)")
+    parser.add_argument('--keyfile', help="private key for --certfile")
+    args = parser.parse_args()
+
+    server = MockTTSServer(('127.0.0.1', args.port), latency=args.latency,
+                           rate_limit_every=args.rate_limit_every, retry_after=args.retry_after,
+                           certfile=args.certfile, keyfile=args.keyfile, jitter=args.jitter,
+                           error_rate=args.error_rate, payload_bytes=args.payload_bytes)
+    print(f"Mock TTS listening on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# ABOUTME: Incremental build planner comparing schoolBee_*.txt hashes with the last build manifest
+# ABOUTME: Produces an explicit plan of words to add, delete, regenerate and JSON files to rewrite
+
+import hashlib
+import json
+import os
+
+from audio_cache import cache_key
+
+BUILD_MANIFEST_VERSION = 1
+
+
+def file_sha256(path):
+    """Hash a file's bytes."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def params_fingerprint(tts_params, variants=None):
+    """
+    Hash of the TTS parameters; a change forces every level to be re-diffed.
+
+    `variants` maps variant keys to their parameters. Without variants the
+    hash is that of `tts_params` alone, as recorded by earlier builds.
+    """
+    payload = tts_params if not variants else {"default": tts_params, "variants": variants}
+    payload = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_build_manifest(path):
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == BUILD_MANIFEST_VERSION:
+            return manifest
+    return {"version": BUILD_MANIFEST_VERSION, "params_fingerprint": None, "levels": {}}
+
+
+def save_build_manifest(manifest, path):
+    """Write the build manifest atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def plan_level(config, manifest, cache, tts_params, parse_words, filename_for,
+               force=False, rescan=False, variant_params=None, pronunciations=None,
+               legacy_params=None, stream=False):
+    """
+    Work out what a single level needs.
+
+    An unchanged source file with unchanged TTS parameters short-circuits
+    without parsing the file or touching any MP3.
+
+    Args:
+        config: Bee config dict with 'level', 'source_file', 'json_file', 'audio_dir'
+        manifest: Build manifest from load_build_manifest
+        cache: AudioCache holding the level -> blob mapping
+        tts_params: Current TTS request parameters
+        parse_words: Callable returning the word list for a source file
+        filename_for: Callable mapping a word to its audio filename (no extension)
+        force: Regenerate every word
+        rescan: Ignore the build manifest and diff against the cache and disk
+        variant_params: Variant key -> TTS parameters for the level's variants
+        pronunciations: PronunciationIndex; an overridden word's cache key
+                        includes its override, so editing one regenerates that word
+        legacy_params: TTS parameters MP3s made before the cache existed were
+                       spoken with; they are adopted only when `tts_params` match
+        stream: Allow a streamed plan for a level the cache knows nothing about
+
+    Returns:
+        Plan dict for the level. A word is listed once even when several of
+        its variants need work; `delete_variants` maps variant keys to
+        filenames whose variant audio is no longer wanted. A streamed plan
+        ("stream": True) has no word lists: every word goes to the
+        synthesizer as the source is read, and orphans are found afterwards.
+    """
+    level = config['level']
+    variant_params = variant_params or {}
+    source_hash = file_sha256(config['source_file'])
+    previous = manifest['levels'].get(level)
+    # Manifests written before per-level backends kept one global fingerprint
+    recorded = (previous or {}).get('params_fingerprint', manifest.get('params_fingerprint'))
+    params_unchanged = recorded == params_fingerprint(tts_params, variant_params)
+    # Any override edit re-diffs the level; only the words it affects regenerate
+    overrides = pronunciations.fingerprint if pronunciations is not None else None
+    overrides_unchanged = (previous or {}).get('pronunciations') == overrides
+
+    plan = {
+        "level": level,
+        "source_hash": source_hash,
+        "words": None,
+        "rewrite_json": False,
+        "add": [],
+        "adopt": [],
+        "regenerate": [],
+        "delete": [],
+        "delete_variants": {},
+        "stream": False,
+    }
+
+    if (not force and not rescan and previous and params_unchanged and overrides_unchanged
+            and previous['source_sha256'] == source_hash
+            and config['json_file'].exists()):
+        return plan
+
+    plan['rewrite_json'] = (force or rescan or previous is None
+                            or previous['source_sha256'] != source_hash
+                            or not config['json_file'].exists())
+
+    known = cache.manifest['levels'].get(level, {})
+    # Nothing cached to compare against: the synthesizer skips, adopts or
+    # reuses each word itself, so it can start before the file is parsed
+    if (stream and not force and not known
+            and not any(key.startswith(f"{level}/") for key in cache.manifest['levels'])):
+        plan['stream'] = True
+        return plan
+
+    words = parse_words(config['source_file'])
+    plan['words'] = words
+    wanted = {}
+    for word in words:
+        wanted.setdefault(filename_for(word), word)
+
+    variant_dirs = {variant['key']: variant['audio_dir'] for variant in config.get('variants', [])}
+    variant_known = {key: cache.manifest['levels'].get(key, {}) for key in variant_params}
+
+    for filename, word in wanted.items():
+        entry = known.get(filename)
+        override = pronunciations.lookup(word) if pronunciations is not None else None
+        if force:
+            plan['regenerate'].append(word)
+        elif entry is None:
+            # Audio from before the cache was spoken as written with the legacy settings,
+            # so an overridden word, or other settings, redo it
+            if (override is None and tts_params == legacy_params
+                    and (config['audio_dir'] / f"{filename}.mp3").exists()):
+                plan['adopt'].append(word)
+            else:
+                plan['add'].append(word)
+        elif entry != cache_key(word, tts_params, override):
+            plan['regenerate'].append(word)
+        elif rescan and not (config['audio_dir'] / f"{filename}.mp3").exists():
+            plan['add'].append(word)
+        else:
+            # The default audio is current; a variant may still be missing or stale
+            for key, params in variant_params.items():
+                variant_entry = variant_known[key].get(filename)
+                if variant_entry is None or (
+                        rescan and not (variant_dirs[key] / f"{filename}.mp3").exists()):
+                    plan['add'].append(word)
+                    break
+                if variant_entry != cache_key(word, params, override):
+                    plan['regenerate'].append(word)
+                    break
+
+    present = set(known)
+    # MP3s from before the cache, or never recorded in it, are only found on disk
+    if (rescan or not known) and config['audio_dir'].is_dir():
+        present.update(path.stem for path in config['audio_dir'].glob('*.mp3'))
+    plan['delete'] = sorted(present - set(wanted))
+    # Variant audio of removed words, and every file of variants the level dropped
+    for key, entries in cache.manifest['levels'].items():
+        if key.startswith(f"{level}/"):
+            stale = set(entries) if key not in variant_params else set(entries) - set(wanted)
+            if stale:
+                plan['delete_variants'][key] = sorted(stale)
+    return plan
+
+
+def plan_edit(config, cache, words, added, removed, filename_for):
+    """
+    Plan a level from a line diff of its source file (watch mode).
+
+    Unlike plan_level, only the diffed words are looked at: `added` words
+    go to the synthesizer, which still reuses any cached audio, and the
+    audio of `removed` words is deleted unless a remaining word shares
+    its filename.
+
+    Args:
+        words: The level's words after the edit, in order
+        added: Words new to the list
+        removed: Words no longer in the list
+    """
+    wanted = {filename_for(word) for word in words}
+    gone = sorted({filename_for(word) for word in removed} - wanted)
+    delete_variants = {}
+    for variant in config.get('variants', []):
+        entries = cache.manifest['levels'].get(variant['key'], {})
+        stale = [filename for filename in gone if filename in entries]
+        if stale:
+            delete_variants[variant['key']] = stale
+
+    return {
+        "level": config['level'],
+        "source_hash": file_sha256(config['source_file']),
+        "words": words,
+        "rewrite_json": True,
+        "add": [word for word in dict.fromkeys(added) if word in words],
+        "adopt": [],
+        "regenerate": [],
+        "delete": gone,
+        "delete_variants": delete_variants,
+        "stream": False,
+    }
+
+
+def plan_is_empty(plan):
+    return not (plan['rewrite_json'] or plan['stream'] or plan['add'] or plan['adopt']
+                or plan['regenerate'] or plan['delete'] or plan['delete_variants'])
+
+
+def print_plan(plans):
+    """Print a human-readable build plan."""
+    print(f"\n{'='*70}")
+    print("BUILD PLAN")
+    print(f"{'='*70}")
+    for plan in plans:
+        level = plan['level']
+        if plan_is_empty(plan):
+            print(f"  {level}: up to date")
+            continue
+
+        if plan['stream']:
+            print(f"  {level}: rewrite JSON, every word as it is read (nothing cached yet)")
+            continue
+
+        parts = []
+        if plan['rewrite_json']:
+            parts.append("rewrite JSON")
+        parts.append(f"+{len(plan['add'])} add")
+        if plan['adopt']:
+            parts.append(f"{len(plan['adopt'])} adopt")
+        parts.append(f"{len(plan['regenerate'])} regenerate")
+        parts.append(f"-{len(plan['delete'])} delete")
+        if plan['delete_variants']:
+            count = sum(len(filenames) for filenames in plan['delete_variants'].values())
+            parts.append(f"-{count} variant files")
+        print(f"  {level}: {', '.join(parts)}")
+
+        for word in plan['add']:
+            print(f"      + {word}")
+        for word in plan['regenerate']:
+            print(f"      ~ {word}")
+        for filename in plan['delete']:
+            print(f"      - {filename}.mp3")
+    print(f"{'='*70}\n")
+
+
+def record_level(manifest, plan, config, project_root, tts_params, variant_params=None,
+                 pronunciations=None):
+    """Mark a level as built from its current source file with `tts_params`."""
+    record = {
+        "source": str(config['source_file'].relative_to(project_root)),
+        "source_sha256": plan['source_hash'],
+        "json_file": str(config['json_file'].relative_to(project_root)),
+        "params_fingerprint": params_fingerprint(tts_params, variant_params),
+    }
+    if pronunciations is not None and pronunciations.fingerprint:
+        record["pronunciations"] = pronunciations.fingerprint
+    manifest['levels'][plan['level']] = record
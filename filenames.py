@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# ABOUTME: Word-to-audio-filename sanitizer built once from the shared filename_rules.json spec
+# ABOUTME: Also generates js/filename_rules.js and checks Python/JS parity over every word list
+
+import json
+import shutil
+import sys
+import unicodedata
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+RULES_FILE = PROJECT_ROOT / 'filename_rules.json'
+JS_RULES_FILE = PROJECT_ROOT / 'js' / 'filename_rules.js'
+
+with open(RULES_FILE, 'r', encoding='utf-8') as _f:
+    RULES = json.load(_f)
+
+
+class _Translation(dict):
+    """
+    str.translate table covering all of Unicode.
+
+    Characters are resolved the first time they are seen and memoized, so
+    after warm-up sanitizing is a single C-level translate pass.
+    """
+
+    def __init__(self, rules):
+        super().__init__()
+        self.fold = rules['fold']
+        self.allowed = frozenset(rules['allowed'])
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char in self.allowed:
+            value = char
+        elif char in self.fold:
+            value = self.fold[char]
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_TRANSLATION = _Translation(RULES)
+_SEPARATOR = RULES['separator']
+
+
+def sanitize_filename(word):
+    """
+    Convert word to filename format matching the JavaScript implementation.
+
+    Lowercase, NFKD-decompose so accents become separate combining marks,
+    join whitespace runs with the separator, then one translate pass that
+    folds, keeps allowed characters and drops everything else (including
+    the combining marks and apostrophes).
+    """
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return _SEPARATOR.join(decomposed.split()).translate(_TRANSLATION)
+
+
+def render_js_rules():
+    """JavaScript source equivalent of sanitize_filename, generated from the spec."""
+    rules = {key: RULES[key] for key in ('separator', 'fold', 'allowed')}
+    allowed = ''.join(sorted(set(RULES['allowed'])))
+    return (
+        "// ABOUTME: Filename sanitizer shared with the Python build - generated by filenames.py\n"
+        "// ABOUTME: Do not edit; change filename_rules.json and run `python filenames.py --write-js`\n"
+        "\n"
+        f"const FILENAME_RULES = {json.dumps(rules, ensure_ascii=False)};\n"
+        f"const FILENAME_ALLOWED = new Set({json.dumps(allowed)});\n"
+        "\n"
+        "function sanitizeFileName(word) {\n"
+        "    const decomposed = word.toLowerCase().normalize('NFKD');\n"
+        "    const joined = decomposed.split(/\\s+/).filter(Boolean).join(FILENAME_RULES.separator);\n"
+        "    let result = '';\n"
+        "    for (const char of joined) {\n"
+        "        if (FILENAME_ALLOWED.has(char)) {\n"
+        "            result += char;\n"
+        "        } else if (Object.prototype.hasOwnProperty.call(FILENAME_RULES.fold, char)) {\n"
+        "            result += FILENAME_RULES.fold[char];\n"
+        "        }\n"
+        "    }\n"
+        "    return result;\n"
+        "}\n"
+        "\n"
+        "if (typeof module !== 'undefined') {\n"
+        "    module.exports = { sanitizeFileName };\n"
+        "}\n"
+    )
+
+
+def parity_corpus():
+    """Every word the app can show, plus the spec's examples."""
+    words = list(RULES['examples'])
+    for path in sorted(PROJECT_ROOT.glob('schoolBee_*.txt')):
+        with open(path, 'r', encoding='utf-8') as f:
+            words.extend(line.strip() for line in f if line.strip())
+    for path in sorted((PROJECT_ROOT / 'data').glob('words_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            words.extend(w['word'] for w in json.load(f)['words'])
+    return list(dict.fromkeys(words))
+
+
+def check_parity():
+    """
+    Compare Python and JavaScript filenames for every word.
+
+    Returns:
+        List of (word, python_name, js_name, expected) mismatches. The JS
+        side is skipped (js_name None) when node is not installed.
+    """
+    words = parity_corpus()
+    python_names = [sanitize_filename(word) for word in words]
+
+    js_names = [None] * len(words)
+    node = shutil.which('node')
+    if node:
+        import subprocess
+
+        script = (
+            f"const {{ sanitizeFileName }} = require({json.dumps(str(JS_RULES_FILE))});\n"
+            "const words = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n"
+            "process.stdout.write(JSON.stringify(words.map(sanitizeFileName)));\n"
+        )
+        result = subprocess.run([node, '-e', script], input=json.dumps(words).encode('utf-8'),
+                                capture_output=True, check=True)
+        js_names = json.loads(result.stdout)
+
+    mismatches = []
+    for word, py_name, js_name in zip(words, python_names, js_names):
+        expected = RULES['examples'].get(word, py_name)
+        if py_name != expected or (js_name is not None and js_name != py_name):
+            mismatches.append((word, py_name, js_name, expected))
+    return mismatches
+
+
+def main():
+    if '--write-js' in sys.argv:
+        JS_RULES_FILE.write_text(render_js_rules(), encoding='utf-8')
+        print(f"Wrote {JS_RULES_FILE.relative_to(PROJECT_ROOT)}")
+
+    if JS_RULES_FILE.read_text(encoding='utf-8') != render_js_rules():
+        print(f"❌ {JS_RULES_FILE.relative_to(PROJECT_ROOT)} is out of date; run with --write-js")
+        sys.exit(1)
+
+    if not shutil.which('node'):
+        print("⚠️  node not found - checking Python against the spec examples only")
+
+    mismatches = check_parity()
+    corpus_size = len(parity_corpus())
+    if mismatches:
+        print(f"❌ {len(mismatches)} of {corpus_size} words differ:")
+        for word, py_name, js_name, expected in mismatches:
+            print(f"  {word!r}: python={py_name!r} js={js_name!r} expected={expected!r}")
+        sys.exit(1)
+    print(f"✅ Python and JavaScript agree on all {corpus_size} words")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,174 +1,615 @@
 #!/usr/bin/env python3
-# ABOUTME: Generates pronunciation audio files for all spelling bee levels (1B, 2B, 3B)
-# ABOUTME: Reads words from text files and creates organized MP3 files using OpenAI TTS
+# ABOUTME: Generates pronunciation audio files for every spelling bee level in levels.json
+# ABOUTME: Reads words from text files and creates organized MP3 files with OpenAI TTS or a local backend
 
+import argparse
 import json
 import os
-import ssl
 import time
 from pathlib import Path
-from openai import OpenAI
-from dotenv import load_dotenv
-import certifi
-
-# Fix SSL certificate verification issue on macOS
-os.environ['SSL_CERT_FILE'] = certifi.where()
-os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
-
-def sanitize_filename(word):
-    """
-    Convert word to filename format matching the JavaScript implementation.
-    """
-    return (word
-        .lower()
-        .replace(' ', '_')
-        .replace("'", '')
-        .replace("'", '')
-        .replace('à', 'a').replace('â', 'a').replace('ä', 'a')
-        .replace('é', 'e').replace('è', 'e').replace('ê', 'e').replace('ë', 'e')
-        .replace('î', 'i').replace('ï', 'i')
-        .replace('ô', 'o').replace('ö', 'o')
-        .replace('ù', 'u').replace('û', 'u').replace('ü', 'u')
-        .translate(str.maketrans('', '', ''.join(c for c in '!"#$%&()*+,-./:;<=>?@[\\]^`{|}~' if c not in '_')))
-    )
 
-def parse_word_file(file_path):
+from audio_bundles import (
+    build_level_bundle,
+    bundle_index,
+    load_bundle_manifest,
+    save_bundle_manifest,
+)
+from audio_cache import AudioCache, cache_key
+from build_plan import (
+    load_build_manifest,
+    plan_edit,
+    plan_is_empty,
+    plan_level,
+    print_plan,
+    record_level,
+    save_build_manifest,
+)
+from filenames import sanitize_filename
+from http_client import RequestTimings, create_http_client
+from job_journal import FAILED as JOURNAL_FAILED, JOURNAL_FILE, JobJournal, is_complete_audio
+from levels import load_levels
+from metrics import NORMAL, QUIET, VERBOSE, BuildMetrics, console
+from pronunciations import load_pronunciations, synthesis_input
+from precache_manifest import (
+    STATE_FILE as PRECACHE_STATE_FILE,
+    precache_is_current,
+    update_precache_manifest,
+)
+from tts_backends import BACKENDS, DEFAULT_BACKEND, OpenAIBackend, create_backend
+from tts_engine import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RATE,
+    TokenBucket,
+    run_jobs,
+)
+from word_index import index_is_current, read_words_json, write_word_index
+
+CACHE_DIR_NAME = '.audio_cache'
+
+# Everything sent to the TTS endpoint besides the text; part of every cache key
+TTS_PARAMS = {
+    "model": "gpt-4o-mini-tts",
+    "voice": "alloy",
+    "response_format": "mp3",
+}
+
+def iter_word_file(file_path):
     """
-    Parse a word file and return list of words (ignoring empty lines).
+    Yield words from a word file one line at a time (ignoring empty lines).
     """
-    words = []
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
             word = line.strip()
             if word:  # Skip empty lines
-                words.append(word)
-    return words
+                yield word
 
-def create_words_json(words, output_path):
+def iter_unique_words(words):
     """
-    Create a words.json file from a list of words.
+    Drop words whose audio filename was already seen, keeping the first.
+
+    Only the filenames are remembered, so memory grows with the number of
+    distinct words rather than with the size of the input.
+    """
+    seen = set()
+    for word in words:
+        filename = sanitize_filename(word)
+        if filename not in seen:
+            seen.add(filename)
+            yield word
+
+def parse_word_file(file_path):
     """
-    words_data = {
-        "words": [
-            {"id": idx + 1, "word": word}
-            for idx, word in enumerate(words)
-        ]
-    }
+    Parse a word file and return list of unique words (ignoring empty lines).
+    """
+    return list(iter_unique_words(iter_word_file(file_path)))
+
+def write_words_json_stream(words, output_path):
+    """
+    Write a words.json file incrementally while passing word objects through.
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(words_data, f, indent=2, ensure_ascii=False)
+    Produces the same bytes as create_words_json but never holds the list:
+    each {"id", "word"} object is written and then yielded, so a consumer
+    (the synthesis queue) can start before the input is exhausted. The file
+    is written to a temporary path and renamed into place once complete.
+    """
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    completed = False
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "words": [')
+            count = 0
+            for count, word in enumerate(words, start=1):
+                f.write(',' if count > 1 else '')
+                f.write(f'\n    {{\n      "id": {count},\n      "word": '
+                        f'{json.dumps(word, ensure_ascii=False)}\n    }}')
+                yield {"id": count, "word": word}
+            f.write('\n  ]\n}' if count else ']\n}')
+        os.replace(tmp_path, output_path)
+        completed = True
+    finally:
+        if not completed and tmp_path.exists():
+            tmp_path.unlink()
 
+def create_words_json(words, output_path):
+    """
+    Create a words.json file from a list of words.
+    """
+    words_data = {"words": list(write_words_json_stream(words, output_path))}
     return words_data
 
-def generate_audio_for_bee(client, bee_level, words, audio_dir, force_regenerate=False):
+def generate_audio_for_bee(backend, bee_level, words, audio_dir, force_regenerate=False,
+                           concurrency=DEFAULT_CONCURRENCY, limiter=None, cache=None,
+                           batch_size=0, total=None, journal=None, retry_failed=False,
+                           metrics=None, variants=None, pronunciations=None):
     """
     Generate audio files for a specific bee level.
 
+    Each unique (word, backend parameters) pair is synthesized once into the
+    content-addressed cache; the per-level MP3 is a hardlink to that blob.
+    Every variant of a word is queued to the same worker pool, so variants
+    share the concurrency budget, and identical requests are made once.
+
     Args:
-        client: OpenAI client instance
-        bee_level: Bee level (1B, 2B, 3B)
-        words: List of word dictionaries with 'id' and 'word'
+        backend: TTSBackend from tts_backends, shared by all levels
+        bee_level: Bee level id from levels.json
+        words: Iterable of word dictionaries with 'id' and 'word'; consumed lazily
         audio_dir: Directory to save audio files
         force_regenerate: If True, regenerate all files
+        concurrency: Maximum number of TTS requests in flight (local backends use their own)
+        limiter: Shared TokenBucket (one is created if omitted)
+        cache: AudioCache shared by all levels
+        batch_size: Words per TTS request; values above 1 enable batch mode (OpenAI only)
+        total: Number of words in the level, for progress labels
+        journal: JobJournal recording each job's state, for resuming
+        retry_failed: Retry words the journal lists as failed in an earlier run
+        metrics: BuildMetrics shared by all levels (one is created if omitted)
+        variants: The level's variant configs from levels.load_levels
+        pronunciations: PronunciationIndex of overrides applied before synthesis
     """
     # Ensure audio directory exists
     audio_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"\n{'='*70}")
-    print(f"Processing {bee_level}: {len(words)} words")
-    print(f"Audio directory: {audio_dir}")
-    print(f"{'='*70}\n")
+    if limiter is None:
+        limiter = TokenBucket()
+    if cache is None:
+        cache = AudioCache(audio_dir.parent / CACHE_DIR_NAME)
+    if metrics is None:
+        metrics = BuildMetrics()
+    tts_params = backend.params
+    concurrency = backend.workers or concurrency
+
+    # (cache level key, variant id, TTS parameters, directory) for every output of a word
+    outputs = [(bee_level, None, tts_params, audio_dir)]
+    for variant in variants or []:
+        variant['audio_dir'].mkdir(parents=True, exist_ok=True)
+        outputs.append((variant['key'], variant['id'], backend.variant_params(variant['settings']),
+                        variant['audio_dir']))
+
+    if total is None and hasattr(words, '__len__'):
+        total = len(words)
+    if backend.name == OpenAIBackend.name:
+        engine = f"Concurrency: {concurrency} workers, {limiter.max_rate:g} req/s"
+    else:
+        engine = f"Backend: {backend.name} ({concurrency} processes)"
+    console.info(f"\n{'='*70}\n"
+                 f"Processing {bee_level}: {total if total is not None else 'streamed'} words"
+                 + (f" (+{len(outputs) - 1} variants)\n" if len(outputs) > 1 else "\n") +
+                 f"Audio directory: {audio_dir}\n"
+                 f"{engine}\n"
+                 f"{'='*70}\n")
 
     generated = 0
     skipped = 0
     failed = 0
 
-    for word_obj in words:
-        word = word_obj['word']
-        word_id = word_obj['id']
-        filename = sanitize_filename(word)
-        output_path = audio_dir / f"{filename}.mp3"
-
-        # Skip if file exists and not forcing regeneration
-        if output_path.exists() and not force_regenerate:
-            print(f"[{bee_level}] [{word_id:3d}/{len(words)}] ⏭️  Skipping '{word}' (already exists)")
-            skipped += 1
-            continue
+    def plan_jobs():
+        """Turn incoming words into synthesis jobs, one per variant, lazily."""
+        nonlocal skipped, failed
+        for word_obj in words:
+            word = word_obj['word']
+            word_id = word_obj['id']
+            filename = sanitize_filename(word)
+            override = pronunciations.lookup(word) if pronunciations is not None else None
+            text, hint = synthesis_input(word, override)
+
+            for level_key, variant_id, params, output_dir in outputs:
+                output_path = output_dir / f"{filename}.mp3"
+                tag = f"{bee_level}:{variant_id}" if variant_id else bee_level
+                label = (f"[{tag}] [{word_id:3d}/{total}]" if total is not None
+                         else f"[{tag}] [{word_id:3d}]")
+                key = cache_key(word, params, override)
+                entry = cache.level_entry(level_key, filename)
+
+                # A file that predates the cache came from the OpenAI API with the
+                # default TTS_PARAMS, spoken as written. Keep it as the blob for those
+                # parameters before another backend, voice or override replaces it, so
+                # switching back costs no API calls; a truncated leftover of an
+                # interrupted run is discarded instead.
+                if entry is None and variant_id is None and output_path.exists():
+                    legacy_key = cache_key(word, TTS_PARAMS)
+                    if not cache.has_blob(legacy_key, TTS_PARAMS):
+                        if is_complete_audio(output_path, TTS_PARAMS['response_format']):
+                            cache.adopt(legacy_key, word, TTS_PARAMS, output_path)
+                        else:
+                            console.info(f"{label} 🧹 Discarding incomplete '{output_path.name}'")
+                            output_path.unlink()
+
+                if not force_regenerate:
+
+                    # Up to date: manifest points at the current key
+                    if entry == key and output_path.exists():
+                        console.detail(f"{label} ⏭️  Skipping '{word}' (already exists)")
+                        metrics.word(level_key, 'skipped')
+                        skipped += 1
+                        continue
+
+                    # Gave up on this word in an earlier run
+                    if (journal is not None and not retry_failed
+                            and journal.state(key) == JOURNAL_FAILED):
+                        console.detail(f"{label} ⏭️  Skipping '{word}' (failed in an earlier run, "
+                                       f"use --retry-failed)")
+                        cache.mark_failed(level_key)
+                        metrics.word(level_key, 'failed')
+                        failed += 1
+                        continue
+
+                    # Another level, variant or earlier run already synthesized this utterance
+                    if cache.has_blob(key, params):
+                        cache.materialize(level_key, filename, key, params, output_path)
+                        console.detail(f"{label} ♻️  Reusing cached audio for '{word}'")
+                        metrics.word(level_key, 'skipped')
+                        skipped += 1
+                        continue
+
+                # Jobs are shared through the cache, so a word that appears in several
+                # levels or variants (or twice in one) is synthesized once
+                job = {
+                    'word': word,
+                    'text': text,
+                    'override': override,
+                    'key': key,
+                    'params': backend.hinted_params(params, hint),
+                    'blob_path': cache.blob_path(key, params),
+                    'targets': [],
+                    'label': label,
+                    'span': {'queued': time.perf_counter()}
+                }
+                running = cache.claim(key, params, (level_key, filename, output_path), job,
+                                      reuse=not force_regenerate)
+                if running is None:
+                    cache.materialize(level_key, filename, key, params, output_path)
+                    console.detail(f"{label} ♻️  Reusing cached audio for '{word}'")
+                    metrics.word(level_key, 'skipped')
+                    skipped += 1
+                elif running is job:
+                    if journal is not None:
+                        journal.pending(job, level_key, params)
+                    yield job
+
+    def synthesize(job):
+        job['span']['started'] = time.perf_counter()
+        job['blob_path'].parent.mkdir(parents=True, exist_ok=True)
+        if journal is not None:
+            journal.started(job['key'])
+        return backend.synthesize(job['text'], job['blob_path'], limiter, job['label'],
+                                  span=job['span'], params=job['params'])
+
+    ffmpeg = None
+    if batch_size > 1:
+        from batch_synthesis import batched, find_ffmpeg, synthesize_batch
+        ffmpeg = find_ffmpeg() if backend.supports_batch else None
+    if batch_size > 1 and ffmpeg is None:
+        if backend.supports_batch:
+            console.info("⚠️  Batch mode needs ffmpeg to split audio; using single-word requests")
+        else:
+            console.info(f"⚠️  The {backend.name} backend does not batch; "
+                         f"using single-word requests")
+
+    def speaks_alone(job):
+        # A batch request carries its own instructions, so it would drop an
+        # overridden word's hint or a variant's instructions
+        return job['override'] is not None or 'instructions' in job['params']
+
+    def synthesize_group(group):
+        if speaks_alone(group[0]):
+            return [synthesize(group[0])]
+        for job in group:
+            job['span']['started'] = time.perf_counter()
+            job['blob_path'].parent.mkdir(parents=True, exist_ok=True)
+            if journal is not None:
+                journal.started(job['key'])
+        return synthesize_batch(backend.client, group, limiter, group[0]['params'], ffmpeg,
+                                cache.root / 'scratch')
+
+    def results():
+        if ffmpeg is None:
+            yield from run_jobs(plan_jobs(), synthesize, concurrency)
+            return
+        # A batch is one request, so only jobs of the same variant share one
+        batches = batched(plan_jobs(), batch_size,
+                          key=lambda job: job['key'] if speaks_alone(job)
+                          else cache_key('', job['params']))
+        for group, errors in run_jobs(batches, synthesize_group, concurrency):
+            yield from zip(group, errors)
 
-        # Retry logic for network errors
-        max_retries = 3
-        retry_delay = 2
-
-        for attempt in range(max_retries):
-            try:
-                # Generate speech using OpenAI TTS
-                if attempt == 0:
-                    print(f"[{bee_level}] [{word_id:3d}/{len(words)}] 🔊 Generating '{word}' → {filename}.mp3")
-                else:
-                    print(f"[{bee_level}] [{word_id:3d}/{len(words)}] 🔄 Retrying '{word}' (attempt {attempt + 1}/{max_retries})")
-
-                with client.audio.speech.with_streaming_response.create(
-                    model="gpt-4o-mini-tts",
-                    voice="alloy",
-                    input=word
-                ) as response:
-                    response.stream_to_file(output_path)
+    try:
+        for job, error in results():
+            if journal is not None:
+                journal.finished(job['key'], error)
+            metrics.span(bee_level, job, error, price=backend.price_per_million_chars)
+            if error is None:
+                cache.add_blob(job['key'], job['word'], job['params'])
+                targets = cache.release(job['key'], ok=True)
+                for level, filename, output_path in targets:
+                    cache.materialize(level, filename, job['key'], job['params'], output_path)
+                # The first target claimed the job; the rest joined from other levels or variants
+                metrics.word(targets[0][0], 'generated')
+                for level, _, _ in targets[1:]:
+                    metrics.word(level, 'skipped')
                 generated += 1
-
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-                break
-
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"[{bee_level}] [{word_id:3d}/{len(words)}] ⚠️  Error: {e}. Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    print(f"[{bee_level}] [{word_id:3d}/{len(words)}] ❌ Failed '{word}' after {max_retries} attempts: {e}")
-                    failed += 1
-
-    print(f"\n{bee_level} Summary:")
-    print(f"  ✅ Generated: {generated}")
-    print(f"  ⏭️  Skipped:   {skipped}")
-    print(f"  ❌ Failed:    {failed}")
-    print(f"  📁 Total:     {generated + skipped} files")
+                skipped += len(targets) - 1
+            else:
+                targets = cache.release(job['key'], ok=False)
+                console.error(f"{job['label']} ❌ Failed '{job['word']}' after "
+                              f"{job['span'].get('attempts', DEFAULT_MAX_RETRIES)} attempts: {error}")
+                for level, _, _ in targets:
+                    metrics.word(level, 'failed')
+                failed += len(targets)
+    finally:
+        cache.save()
+
+    console.info(f"\n{bee_level} Summary:\n"
+                 f"  ✅ Generated: {generated}\n"
+                 f"  ⏭️  Skipped:   {skipped}\n"
+                 f"  ❌ Failed:    {failed}\n"
+                 f"  📁 Total:     {generated + skipped} files")
 
     return {"generated": generated, "skipped": skipped, "failed": failed}
 
-def main():
-    """Main entry point."""
-    import sys
+def build_level(config, plan, backend, cache, limiter, force=False,
+                concurrency=DEFAULT_CONCURRENCY, batch_size=0, journal=None, retry_failed=False,
+                metrics=None, pronunciations=None):
+    """
+    Apply one level's build plan: delete orphans, stream the JSON and
+    synthesize the words the plan touches. Runs in a per-level worker.
+
+    Returns:
+        Stats dict with generated, skipped, failed and deleted counts.
+    """
+    level = config['level']
+    json_file = config['json_file']
+    audio_dir = config['audio_dir']
+
+    if plan_is_empty(plan):
+        console.info(f"\n{level}: up to date")
+        return {"generated": 0, "skipped": 0, "failed": 0, "deleted": 0}
+
+    count = f"{len(plan['words'])} words" if plan['words'] is not None else "streaming words"
+    console.info(f"\n{config['source_file'].name}: {count}")
+
+    # Remove audio for words that are no longer in the list
+    deleted = 0
+    for filename in plan['delete']:
+        orphan = audio_dir / f"{filename}.mp3"
+        if orphan.exists():
+            orphan.unlink()
+        cache.forget(level, filename)
+        console.detail(f"[{level}] 🗑️  Deleted orphaned {orphan.name}")
+        deleted += 1
+    variant_dirs = {variant['key']: variant['audio_dir'] for variant in config['variants']}
+    for key, filenames in plan['delete_variants'].items():
+        # Dropped variants are no longer in the config; their directory follows the key
+        variant_dir = variant_dirs.get(key, audio_dir / key.split('/', 1)[1])
+        for filename in filenames:
+            orphan = variant_dir / f"{filename}.mp3"
+            if orphan.exists():
+                orphan.unlink()
+            cache.forget(key, filename)
+            console.detail(f"[{key}] 🗑️  Deleted orphaned {orphan.name}")
+            deleted += 1
+        if key not in variant_dirs and variant_dir.is_dir() and not any(variant_dir.iterdir()):
+            variant_dir.rmdir()
+
+    # Stream the source: JSON is written as words flow to the synthesizer
+    source_words = iter_unique_words(iter_word_file(config['source_file']))
+    if plan['rewrite_json']:
+        console.info(f"Creating {json_file.name}...")
+        word_stream = write_words_json_stream(source_words, json_file)
+    else:
+        word_stream = ({"id": idx + 1, "word": word}
+                       for idx, word in enumerate(source_words))
+
+    # Only the words the plan touches go to the synthesizer
+    touched = set(plan['add']) | set(plan['adopt']) | set(plan['regenerate'])
+    streamed = set()
+
+    def every_word():
+        # A streamed plan sends every word, remembering filenames to find orphans afterwards
+        for word_obj in word_stream:
+            streamed.add(sanitize_filename(word_obj['word']))
+            yield word_obj
+
+    stats = {"generated": 0, "skipped": 0, "failed": 0}
+    if touched or plan['stream']:
+        stats = generate_audio_for_bee(
+            backend,
+            level,
+            every_word() if plan['stream']
+            else (word_obj for word_obj in word_stream if word_obj['word'] in touched),
+            audio_dir,
+            force,
+            concurrency=concurrency,
+            limiter=limiter,
+            cache=cache,
+            batch_size=batch_size,
+            total=len(plan['words']) if plan['words'] is not None else None,
+            journal=journal,
+            retry_failed=retry_failed,
+            metrics=metrics,
+            variants=config['variants'],
+            pronunciations=pronunciations
+        )
+    else:
+        for _ in word_stream:
+            pass
+        cache.save()
+
+    if plan['stream']:
+        for orphan in sorted(audio_dir.glob('*.mp3')):
+            if orphan.stem not in streamed:
+                orphan.unlink()
+                cache.forget(level, orphan.stem)
+                console.detail(f"[{level}] 🗑️  Deleted orphaned {orphan.name}")
+                deleted += 1
+        cache.save()
+
+    return dict(stats, deleted=deleted)
+
+
+def publish_levels(configs, bundle_dir, bundle_manifest, stale_bundles, rebuild_index, html_path,
+                   precache_state):
+    """
+    Make built levels visible to the app: repack the stale levels' audio
+    bundles, rewrite the word index when it (or a bundle) changed, and
+    refresh the offline precache manifest.
+    """
+    # One bundle per level so the app preloads a level with a single request
+    for config in configs:
+        level = config['level']
+        if level not in stale_bundles:
+            continue
+        if build_level_bundle(level, read_words_json(config['json_file']), config['audio_dir'],
+                              bundle_dir, bundle_manifest):
+            entry = bundle_manifest['levels'][level]
+            console.info(f"\n📦 Packed {entry['file']} ({entry['size'] / 1024:.0f} KB)")
+            rebuild_index = True
+    save_bundle_manifest(bundle_manifest, bundle_dir)
+
+    # Level index plus one hashed word file per level, loaded on demand by the app
+    if rebuild_index:
+        index_path = write_word_index(configs, html_path.parent / 'data', html_path,
+                                      bundles=bundle_index(bundle_manifest))
+        console.info(f"\nWrote word index {index_path.name}")
+
+    # Revisions and sizes of every file the service worker may cache
+    precache_path, changed = update_precache_manifest(html_path.parent, configs, precache_state)
+    if changed:
+        console.info(f"\nWrote {precache_path.name}")
+
+
+def watch_levels(levels, cache, limiter, journal, metrics, build_manifest, build_manifest_path,
+                 bundle_dir, bundle_manifest, html_path, precache_state, project_root,
+                 concurrency=DEFAULT_CONCURRENCY, batch_size=0, pronunciations=None, debounce=None):
+    """
+    Rebuild levels as their word files are edited, until interrupted.
 
-    # Load environment variables from .env file
-    load_dotenv()
+    Each save is diffed line by line against the previous version. Only the
+    added words are queued for synthesis, through the job journal, so words
+    still pending when the watcher stops are picked up by the next run. The
+    words JSON is replaced atomically and the bundle, word index and
+    precache manifest are refreshed so the app sees the edit on reload.
 
-    # Get API key from environment or prompt
-    api_key = os.environ.get('OPENAI_API_KEY')
+    Args:
+        levels: (config, backend, variant_params) per level, in registry order
+        debounce: Quiet seconds before an edit is built (watch_sources.DEBOUNCE if omitted)
+    """
+    from watch_sources import DEBOUNCE, SourceWatcher, diff_words
 
-    if not api_key:
-        print("OpenAI API key not found in environment.")
-        api_key = input("Please enter your OpenAI API key: ").strip()
+    configs = [config for config, _, _ in levels]
+    sources = {config['source_file'].resolve(): (config, backend, variant_params)
+               for config, backend, variant_params in levels}
+    words_by_level = {config['level']: parse_word_file(config['source_file']) for config in configs}
 
-        if not api_key:
-            print("Error: API key is required")
-            sys.exit(1)
+    watcher = SourceWatcher(sources)
+    console.info(f"\n👀 Watching {', '.join(path.name for path in sources)} "
+                 f"({watcher.mode}) - press Ctrl-C to stop")
+    try:
+        for changed in watcher.changes(DEBOUNCE if debounce is None else debounce):
+            rebuilt = []
+            for path in sorted(changed):
+                config, backend, variant_params = sources[path]
+                level = config['level']
+                if not path.exists():
+                    console.error(f"[{level}] ⚠️  {path.name} was removed; keeping the last build")
+                    continue
+                words = parse_word_file(path)
+                if words == words_by_level[level]:
+                    continue
+                if not words:
+                    # Usually a save caught between truncate and write; the write
+                    # fires another change. Clearing a level is left to a full run.
+                    console.error(f"[{level}] ⚠️  {path.name} is empty; keeping the last build")
+                    continue
+                added, removed = diff_words(words_by_level[level], words)
+                words_by_level[level] = words
+                console.info(f"\n[{time.strftime('%H:%M:%S')}] {path.name}: "
+                             f"+{len(added)} -{len(removed)} words ({len(words)} total)")
+                for word in added:
+                    console.detail(f"      + {word}")
+                for word in removed:
+                    console.detail(f"      - {word}")
+
+                plan = plan_edit(config, cache, words, added, removed, sanitize_filename)
+                stats = build_level(config, plan, backend, cache, limiter,
+                                    concurrency=concurrency, batch_size=batch_size,
+                                    journal=journal, metrics=metrics,
+                                    pronunciations=pronunciations)
+                # A failed word stays unrecorded, so the next full run retries it
+                if not stats['failed']:
+                    record_level(build_manifest, plan, config, project_root, backend.params,
+                                 variant_params, pronunciations)
+                rebuilt.append(level)
+                console.info(f"  ✅ {stats['generated']} generated, {stats['skipped']} reused, "
+                             f"{stats['failed']} failed, {stats['deleted']} deleted")
+
+            if rebuilt:
+                save_build_manifest(build_manifest, build_manifest_path)
+                publish_levels(configs, bundle_dir, bundle_manifest, rebuilt, True,
+                               html_path, precache_state)
+    except KeyboardInterrupt:
+        console.info("\nStopped watching")
+    finally:
+        watcher.close()
+
+
+def parse_args(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description="Generate pronunciation audio for all bee levels")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="regenerate every file, overwriting existing audio")
+    parser.add_argument('-j', '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"TTS requests in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"maximum TTS requests per second (default: {DEFAULT_RATE:g})")
+    parser.add_argument('--backend', choices=sorted(BACKENDS),
+                        help="TTS engine for every level, overriding levels.json "
+                             f"(default: each level's \"backend\", else {DEFAULT_BACKEND})")
+    parser.add_argument('--model', default=TTS_PARAMS['model'],
+                        help=f"TTS model (default: {TTS_PARAMS['model']})")
+    parser.add_argument('--voice', default=TTS_PARAMS['voice'],
+                        help=f"TTS voice (default: {TTS_PARAMS['voice']})")
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help="words per TTS request, split locally by silence (requires ffmpeg)")
+    parser.add_argument('--postprocess', action='store_true',
+                        help="trim silence, normalize loudness and re-encode audio (requires ffmpeg)")
+    parser.add_argument('--bitrate', default='48k',
+                        help="MP3 bitrate used by --postprocess (default: 48k)")
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help="print the build plan without changing anything")
+    parser.add_argument('--rescan', action='store_true',
+                        help="ignore the build manifest and re-check every word against disk")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="retry words that failed in an earlier run (skipped by default)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_const', dest='verbosity',
+                           const=VERBOSE, default=NORMAL,
+                           help="print a line per word instead of the progress bar")
+    verbosity.add_argument('-q', '--quiet', action='store_const', dest='verbosity', const=QUIET,
+                           help="only print errors and the final summary")
+    parser.add_argument('--watch', action='store_true',
+                        help="after building, keep rebuilding levels as their word files change")
+    parser.add_argument('--metrics', type=Path, metavar='PATH',
+                        help="export per-word spans as JSON lines, or totals as a Prometheus "
+                             "text file if PATH ends in .prom")
+    return parser.parse_args(argv)
+
+def main(argv=None, prog=None):
+    """Main entry point."""
+    import sys
 
-    # Check for force regenerate flag
-    force_regenerate = '--force' in sys.argv or '-f' in sys.argv
+    args = parse_args(argv, prog)
+    console.verbosity = args.verbosity
 
-    if force_regenerate:
+    force_regenerate = args.force
+
+    if force_regenerate and not args.dry_run:
         print("Force regeneration enabled - will overwrite existing files")
         confirm = input("Continue? (y/n): ").strip().lower()
         if confirm != 'y':
             print("Aborted")
             sys.exit(0)
 
-    # Initialize OpenAI client with SSL workaround for macOS
-    import httpx
-    http_client = httpx.Client(verify=False)
-    client = OpenAI(api_key=api_key, http_client=http_client)
-
     project_root = Path(__file__).parent
 
     # Create data directory for JSON files
@@ -178,70 +619,215 @@ def main():
     # Create audio directory structure
     audio_root = project_root / 'audio'
 
-    # Process each bee level
-    bee_configs = [
-        {
-            'level': '1B',
-            'source_file': project_root / 'schoolBee_1.txt',
-            'json_file': data_dir / 'words_1B.json',
-            'audio_dir': audio_root / '1B'
-        },
-        {
-            'level': '2B',
-            'source_file': project_root / 'schoolBee_2.txt',
-            'json_file': data_dir / 'words_2B.json',
-            'audio_dir': audio_root / '2B'
-        },
-        {
-            'level': '3B',
-            'source_file': project_root / 'schoolBee_3.txt',
-            'json_file': data_dir / 'words_3B.json',
-            'audio_dir': audio_root / '3B'
-        }
-    ]
+    # Shared blob store: each unique utterance is synthesized once across levels
+    cache = AudioCache(project_root / CACHE_DIR_NAME)
+    tts_params = dict(TTS_PARAMS, model=args.model, voice=args.voice)
+
+    build_manifest_path = project_root / CACHE_DIR_NAME / 'build.json'
+    build_manifest = load_build_manifest(build_manifest_path)
 
-    total_stats = {"generated": 0, "skipped": 0, "failed": 0}
+    # Every level, in display order, comes from the shared registry
+    try:
+        bee_configs = load_levels(project_root)
+        pronunciations = load_pronunciations(project_root)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
+    # TTS engine per level: --backend overrides the registry's per-level choice
+    backends = {}
+    level_backends = []
     try:
         for config in bee_configs:
-            level = config['level']
-            source_file = config['source_file']
-            json_file = config['json_file']
-            audio_dir = config['audio_dir']
-
-            # Parse words from text file
-            print(f"\nParsing {source_file.name}...")
-            words_list = parse_word_file(source_file)
-            print(f"Found {len(words_list)} words")
-
-            # Create JSON file
-            print(f"Creating {json_file.name}...")
-            words_data = create_words_json(words_list, json_file)
-
-            # Generate audio files
-            stats = generate_audio_for_bee(
-                client,
-                level,
-                words_data['words'],
-                audio_dir,
-                force_regenerate
-            )
-
-            # Accumulate stats
-            for key in total_stats:
+            name = args.backend or config.get('backend', DEFAULT_BACKEND)
+            if name not in backends:
+                backends[name] = create_backend(name, openai_params=tts_params)
+            level_backends.append(backends[name])
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # Request parameters of each level's variants, keyed like the cache ("1B/slow")
+    level_variant_params = [
+        {variant['key']: backend.variant_params(variant['settings'])
+         for variant in config['variants']}
+        for config, backend in zip(bee_configs, level_backends)
+    ]
+
+    # Diff sources against the last build before touching anything
+    plans = [
+        plan_level(config, build_manifest, cache, backend.params, parse_word_file,
+                   sanitize_filename, force=force_regenerate, rescan=args.rescan,
+                   variant_params=variant_params, pronunciations=pronunciations,
+                   legacy_params=TTS_PARAMS, stream=not args.dry_run)
+        for config, backend, variant_params in zip(bee_configs, level_backends,
+                                                   level_variant_params)
+    ]
+    # Bundles are repacked for changed levels and any level whose bundle is missing
+    bundle_dir = audio_root / 'bundles'
+    bundle_manifest = load_bundle_manifest(bundle_dir)
+    stale_bundles = [
+        plan['level'] for plan in plans
+        if not plan_is_empty(plan)
+        or plan['level'] not in bundle_manifest['levels']
+        or not (audio_root / bundle_manifest['levels'][plan['level']]['file']).exists()
+    ]
+
+    html_path = project_root / 'index.html'
+    rebuild_index = (any(plan['rewrite_json'] for plan in plans)
+                     or not index_is_current(html_path, bee_configs))
+    print_plan(plans)
+    if stale_bundles:
+        print(f"Audio bundles: repack {', '.join(stale_bundles)}")
+    if rebuild_index:
+        print("Word index: rebuild")
+
+    if args.dry_run:
+        return
+
+    precache_state = project_root / CACHE_DIR_NAME / PRECACHE_STATE_FILE
+    if (all(plan_is_empty(plan) for plan in plans) and not stale_bundles and not rebuild_index
+            and not args.postprocess and not args.watch):
+        # No audio changed, so the manifest only needs a refresh after the
+        # app shell or the bundles were touched outside the generator
+        changed = False
+        if not precache_is_current(project_root, precache_state,
+                                   extra=[bundle_dir / 'manifest.json']):
+            _, changed = update_precache_manifest(project_root, bee_configs, precache_state)
+        print("Nothing to do - all levels are up to date"
+              + (" (refreshed the offline precache manifest)" if changed else ""))
+        return
+
+    # Job journal: resume an interrupted run from where it stopped
+    journal = JobJournal(project_root / CACHE_DIR_NAME / JOURNAL_FILE)
+    resumed = journal.recover(cache)
+    if resumed['recovered'] or resumed['discarded']:
+        print(f"Resuming: {resumed['recovered']} finished words recovered, "
+              f"{resumed['discarded']} interrupted words re-queued")
+    previously_failed = journal.count(JOURNAL_FAILED)
+    if previously_failed:
+        action = "retrying" if args.retry_failed or force_regenerate else "skipping (use --retry-failed)"
+        print(f"Journal: {previously_failed} words failed in an earlier run, {action}")
+
+    http_client = None
+    http_timings = RequestTimings()
+    # Adopted files and cached blobs need no request; watch mode may need the
+    # API for any edit later on
+    api_levels = sum(1 for plan, backend in zip(plans, level_backends)
+                     if (args.watch or plan['add'] or plan['regenerate'])
+                     and backend.name == OpenAIBackend.name)
+
+    def connect():
+        """Create the OpenAI client once a job actually calls the API."""
+        nonlocal http_client
+        # Imported here so offline backends work without the OpenAI SDK installed
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        # Load environment variables from .env file
+        load_dotenv()
+
+        # Get API key from environment, or prompt when someone can answer
+        api_key = os.environ.get('OPENAI_API_KEY')
+
+        if not api_key and sys.stdin.isatty():
+            print("OpenAI API key not found in environment.")
+            api_key = input("Please enter your OpenAI API key: ").strip()
+
+        if not api_key:
+            print("Error: an OpenAI API key is required (set OPENAI_API_KEY or add it to .env)")
+            sys.exit(1)
+
+        # One pooled, keep-alive client for every worker, verified against certifi's CA
+        # bundle (which also fixes Python's missing system certificates on macOS)
+        http_client = create_http_client(max(1, api_levels) * args.concurrency,
+                                         timings=http_timings)
+        # Retries are handled by tts_engine so 429s feed the shared rate limiter
+        return OpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+
+    if OpenAIBackend.name in backends:
+        backends[OpenAIBackend.name].connect = connect
+
+    # One bucket for every level keeps the global request rate bounded
+    limiter = TokenBucket(rate=args.rate)
+
+    total_stats = {"generated": 0, "skipped": 0, "failed": 0, "deleted": 0}
+    metrics = BuildMetrics(args.metrics)
+
+    try:
+        # One worker per level; the shared limiter and cache keep the global
+        # request rate bounded and each utterance synthesized once
+        # A streamed level's word count is only known once it has been read
+        console.start_progress(metrics, 0 if any(plan['stream'] for plan in plans) else sum(
+            len(set(plan['add']) | set(plan['adopt']) | set(plan['regenerate']))
+            * (1 + len(config['variants']))
+            for config, plan in zip(bee_configs, plans)
+        ))
+        from concurrent.futures import ThreadPoolExecutor
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(bee_configs))) as pool:
+                futures = [
+                    pool.submit(build_level, config, plan, backend, cache, limiter,
+                                force=force_regenerate, concurrency=args.concurrency,
+                                batch_size=args.batch_size, journal=journal,
+                                retry_failed=args.retry_failed, metrics=metrics,
+                                pronunciations=pronunciations)
+                    for config, plan, backend in zip(bee_configs, plans, level_backends)
+                ]
+                level_stats = [future.result() for future in futures]
+        finally:
+            console.stop_progress()
+
+        for config, plan, stats, backend, variant_params in zip(
+                bee_configs, plans, level_stats, level_backends, level_variant_params):
+            for key in stats:
                 total_stats[key] += stats[key]
 
+            # Failed levels are left unrecorded so the next run re-plans them.
+            # A level's word may have failed in another level's job, so the
+            # cache's per-level count is the one that matters.
+            if not any(cache.failures[key] for key in [config['level'], *variant_params]):
+                record_level(build_manifest, plan, config, project_root, backend.params,
+                             variant_params, pronunciations)
+
+        save_build_manifest(build_manifest, build_manifest_path)
+
+        # Trim, normalize and shrink new audio before it is packed
+        if args.postprocess:
+            from postprocess_audio import postprocess_levels
+            postprocess_levels([audio_dir for config in bee_configs
+                                for audio_dir in [config['audio_dir'],
+                                                  *(v['audio_dir'] for v in config['variants'])]],
+                               project_root / CACHE_DIR_NAME,
+                               settings={"bitrate": args.bitrate})
+            # Let the bundle fingerprints decide which levels actually changed
+            stale_bundles = [config['level'] for config in bee_configs]
+
+        publish_levels(bee_configs, bundle_dir, bundle_manifest, stale_bundles,
+                       rebuild_index, html_path, precache_state)
+
         # Print final summary
         print(f"\n{'='*70}")
         print("🎉 ALL BEES COMPLETE!")
         print(f"{'='*70}")
-        print(f"Total across all bees:")
+        print("Total across all bees:")
         print(f"  ✅ Generated: {total_stats['generated']}")
         print(f"  ⏭️  Skipped:   {total_stats['skipped']}")
         print(f"  ❌ Failed:    {total_stats['failed']}")
+        print(f"  🗑️  Deleted:   {total_stats['deleted']}")
         print(f"  📁 Total:     {total_stats['generated'] + total_stats['skipped']} audio files")
+        metrics.print_summary()
+        http_timings.print_summary()
         print(f"{'='*70}\n")
 
+        if args.watch:
+            watch_levels(list(zip(bee_configs, level_backends, level_variant_params)), cache,
+                         limiter, journal, metrics, build_manifest, build_manifest_path,
+                         bundle_dir, bundle_manifest, html_path, precache_state, project_root,
+                         concurrency=args.concurrency, batch_size=args.batch_size,
+                         pronunciations=pronunciations)
+
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
         sys.exit(1)
@@ -250,6 +836,16 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Once the cache manifest knows every finished blob the journal only
+        # needs the unfinished and failed jobs
+        cache.save()
+        journal.close(drop_done=True)
+        metrics.close()
+        for backend in backends.values():
+            backend.close()
+        if http_client is not None:
+            http_client.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# ABOUTME: Shared, connection-pooled httpx client for the TTS API with certifi verification
+# ABOUTME: Records per-request connect/TLS/TTFB/transfer timings through httpcore's trace hook
+
+import importlib.util
+import threading
+import time
+
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 60.0         # a long phrase can take a while to synthesize
+WRITE_TIMEOUT = 10.0
+POOL_TIMEOUT = 30.0         # waiting for a free connection when every slot is busy
+KEEPALIVE_EXPIRY = 30.0
+
+PHASES = ('connect', 'tls', 'ttfb', 'transfer', 'total')
+
+
+def http2_available():
+    """HTTP/2 needs `h2`, which requirements.txt installs through httpx[http2]."""
+    return importlib.util.find_spec('h2') is not None
+
+
+class RequestTimings:
+    """
+    Collects per-request phase timings from httpcore trace events.
+
+    Phases (seconds):
+        connect:  TCP connect, including DNS resolution (httpcore does both in one step)
+        tls:      TLS handshake
+        ttfb:     request sent until response headers received
+        transfer: response body download
+        total:    first traced event until the response was closed
+
+    connect and tls are absent when a pooled keep-alive connection is reused.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def trace(self):
+        """Return a trace callback for one request."""
+        marks = {}
+
+        def callback(event_name, info):
+            # "http11.receive_response_body.started" -> "receive_response_body", "started"
+            name, _, stage = event_name.rpartition('.')
+            name = name.split('.', 1)[-1]
+            marks.setdefault('first', time.perf_counter())
+            marks[(name, stage)] = time.perf_counter()
+            if name == 'response_closed' and stage == 'complete':
+                self._record(marks)
+
+        return callback
+
+    def _record(self, marks):
+        def span(name):
+            start, end = marks.get((name, 'started')), marks.get((name, 'complete'))
+            return end - start if start is not None and end is not None else None
+
+        sent = marks.get(('send_request_headers', 'started'))
+        headers = marks.get(('receive_response_headers', 'complete'))
+        timing = {
+            "connect": span('connect_tcp'),
+            "tls": span('start_tls'),
+            "ttfb": headers - sent if sent is not None and headers is not None else None,
+            "transfer": span('receive_response_body'),
+            "total": marks[('response_closed', 'complete')] - marks['first'],
+        }
+        with self._lock:
+            self.requests.append(timing)
+
+    def summary(self):
+        """p50/p95/max per phase plus how many requests opened a new connection."""
+        with self._lock:
+            requests = list(self.requests)
+        result = {"requests": len(requests),
+                  "new_connections": sum(1 for r in requests if r['connect'] is not None)}
+        for phase in PHASES:
+            values = sorted(r[phase] for r in requests if r[phase] is not None)
+            if values:
+                result[phase] = {
+                    "p50": values[len(values) // 2],
+                    "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                    "max": values[-1],
+                }
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['requests']:
+            return
+        print(f"HTTP: {summary['requests']} requests, "
+              f"{summary['new_connections']} new connections")
+        for phase in PHASES:
+            if phase in summary:
+                stats = summary[phase]
+                print(f"  {phase:<9} p50 {stats['p50'] * 1000:7.1f}ms  "
+                      f"p95 {stats['p95'] * 1000:7.1f}ms  max {stats['max'] * 1000:7.1f}ms")
+
+
+def create_http_client(concurrency, ca_bundle=None, http2=None, timings=None):
+    """
+    Build the httpx client shared by every TTS worker.
+
+    Args:
+        concurrency: Requests in flight across all levels; sizes the connection pool
+        ca_bundle: CA file to verify against (defaults to certifi's bundle)
+        http2: Force HTTP/2 on or off (defaults to on when `h2` is installed)
+        timings: RequestTimings to record per-request phases into
+    """
+    import ssl
+
+    import certifi
+    import httpx
+
+    context = ssl.create_default_context(cafile=ca_bundle or certifi.where())
+    limits = httpx.Limits(max_connections=concurrency,
+                          max_keepalive_connections=concurrency,
+                          keepalive_expiry=KEEPALIVE_EXPIRY)
+    timeout = httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT,
+                            write=WRITE_TIMEOUT, pool=POOL_TIMEOUT)
+
+    event_hooks = {}
+    if timings is not None:
+        def attach_trace(request):
+            request.extensions['trace'] = timings.trace()
+        event_hooks['request'] = [attach_trace]
+
+    return httpx.Client(
+        verify=context,
+        http2=http2_available() if http2 is None else http2,
+        limits=limits,
+        timeout=timeout,
+        event_hooks=event_hooks,
+    )
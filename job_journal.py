@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# ABOUTME: Append-only JSONL journal of TTS job states so an interrupted build resumes where it stopped
+# ABOUTME: Records pending, in-flight, done and failed jobs with attempt counts and the last error
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from mp3_frames import scan_mp3
+from tts_engine import partial_path
+
+JOURNAL_FILE = 'journal.jsonl'
+
+PENDING = 'pending'
+IN_FLIGHT = 'in-flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def is_complete_audio(path, response_format='mp3'):
+    """
+    Sanity check for a synthesized file: non-empty and, for MP3, every
+    frame header walks cleanly to the end of the file, so output cut off
+    by an interrupted download counts as incomplete.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return False
+    if not data:
+        return False
+    if response_format != 'mp3':
+        return True
+    return scan_mp3(data)['error'] is None
+
+
+class JobJournal:
+    """
+    One JSON line per state change, keyed by the job's cache key.
+
+    Each line carries the job's full latest record (word, params, level,
+    state, attempts, error), so replaying the file and keeping the last
+    line per key restores the state even if the process was killed. The
+    file is compacted to one line per job whenever it is opened.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.jobs = self._replay()
+        self._lock = threading.Lock()
+        self._rewrite(self.jobs.values())
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        jobs = {}
+        if not self.path.exists():
+            return jobs
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final line from a killed run
+                    continue
+                jobs[record['key']] = record
+        return jobs
+
+    def _rewrite(self, records):
+        """Replace the journal with `records`, atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _record(self, key, state, **fields):
+        with self._lock:
+            record = dict(self.jobs.get(key, {}), key=key, state=state, time=time.time(), **fields)
+            self.jobs[key] = record
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def state(self, key):
+        record = self.jobs.get(key)
+        return record['state'] if record else None
+
+    def count(self, state):
+        return sum(1 for record in self.jobs.values() if record['state'] == state)
+
+    def pending(self, job, level, params):
+        """A job has been queued for synthesis."""
+        self._record(job['key'], PENDING, word=job['word'], level=level, params=params,
+                     attempts=self.jobs.get(job['key'], {}).get('attempts', 0), error=None)
+
+    def started(self, key):
+        self._record(key, IN_FLIGHT, attempts=self.jobs[key]['attempts'] + 1)
+
+    def finished(self, key, error=None):
+        if error is None:
+            self._record(key, DONE, error=None)
+        else:
+            self._record(key, FAILED, error=str(error) or type(error).__name__)
+
+    def recover(self, cache):
+        """
+        Reconcile the journal with the audio cache after an interrupted run.
+
+        Finished blobs the cache manifest never recorded are added back, so
+        they are materialized instead of re-synthesized. Leftover partial
+        files of interrupted jobs are removed and "done" blobs that fail the
+        sanity check are dropped so they are generated again.
+
+        Returns:
+            Dict with the number of recovered and discarded jobs.
+        """
+        recovered = discarded = 0
+        for key, record in list(self.jobs.items()):
+            blob = cache.blob_path(key, record['params'])
+            partial = partial_path(blob)
+            if partial.exists():
+                partial.unlink()
+
+            if record['state'] in (PENDING, IN_FLIGHT):
+                discarded += 1
+                self._record(key, PENDING)
+            elif record['state'] == DONE and key not in cache.manifest['blobs']:
+                if is_complete_audio(blob, record['params'].get('response_format', 'mp3')):
+                    cache.add_blob(key, record['word'], record['params'])
+                    recovered += 1
+                else:
+                    if blob.exists():
+                        blob.unlink()
+                    discarded += 1
+                    self._record(key, PENDING)
+        return {"recovered": recovered, "discarded": discarded}
+
+    def close(self, drop_done=False):
+        """
+        Close the journal, optionally forgetting finished jobs.
+
+        Pass `drop_done` once the audio cache manifest has been saved: it
+        then knows every finished blob and only unfinished or failed jobs
+        need to be kept.
+        """
+        with self._lock:
+            self._file.close()
+            if drop_done:
+                self.jobs = {key: record for key, record in self.jobs.items()
+                             if record['state'] != DONE}
+                self._rewrite(self.jobs.values())
@@ -1,46 +1,137 @@
 // ABOUTME: Main application logic for SpellingBee practice website
-// ABOUTME: Handles loading words, pronunciation playback, and reveal/hide functionality
+// ABOUTME: Renders levels from the registry index, loads each level's words on demand, and handles playback, voice variants, reveal/hide, shuffled quiz decks and offline saving
 
-let wordsData = {
-    '1B': [],
-    '2B': [],
-    '3B': []
-};
+// Levels from the registry (levels.json) in display order: id, title, count, url, variants
+let levels = [];
 
-let newWords3B = [];
+// Chosen voice variant per level ('' is the default voice), remembered across visits
+const VARIANT_STORAGE_PREFIX = 'spellingbee-variant-';
+const selectedVariants = {};
 
-async function loadWords() {
+// Words and highlighted (new) words per level, filled when a level is first opened
+const wordsData = {};
+const newWords = {};
+const levelRequests = {};
+
+// Per-level audio bundles: one MP3 per level plus [offset, length] pairs per word
+const audioBundles = {};
+const bundleBuffers = {};
+
+// Build-time difficulty tier (1-5) per word and pre-shuffled quiz orders per level
+const quizDecks = {};
+const deckPositions = {};
+
+async function loadLevels() {
     try {
-        // Load all three bee levels
-        const responses = await Promise.all([
-            fetch('data/words_1B.json'),
-            fetch('data/words_2B.json'),
-            fetch('data/words_3B.json'),
-            fetch('data/words_3B_new.json')
-        ]);
-
-        const [data1B, data2B, data3B, data3BNew] = await Promise.all(
-            responses.map(r => r.json())
-        );
-
-        wordsData['1B'] = data1B.words;
-        wordsData['2B'] = data2B.words;
-        wordsData['3B'] = data3B.words;
-
-        // Store new words for highlighting
-        newWords3B = data3BNew.words.map(w => w.word.toLowerCase());
-
-        renderWords('1B');
-        renderWords('2B');
-        renderWords('3B');
+        // Small content-hashed index written by generate_all_audio.py; words load per level
+        const indexUrl = document.querySelector('meta[name="word-index"]').content;
+        const response = await fetch(indexUrl);
+        const index = await response.json();
+
+        levels = index.levels;
+        renderSections();
         updateStats();
     } catch (error) {
-        console.error('Error loading words:', error);
+        console.error('Error loading levels:', error);
         alert('Error loading words. Please refresh the page.');
     }
 }
 
-function renderWords(beeLevel) {
+function loadLevel(beeLevel) {
+    if (!levelRequests[beeLevel]) {
+        const level = levels.find(l => l.id === beeLevel);
+        levelRequests[beeLevel] = fetch(level.url)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                const toWords = table => (table ? table.split('\n') : [])
+                    .map((word, i) => ({ id: i + 1, word }));
+
+                wordsData[beeLevel] = toWords(data.words);
+                newWords[beeLevel] = toWords(data.new).map(w => w.word.toLowerCase());
+                if (data.bundle) audioBundles[beeLevel] = data.bundle;
+                if (data.difficulty) {
+                    wordsData[beeLevel].forEach((wordObj, i) => {
+                        wordObj.difficulty = Number(data.difficulty[i]);
+                    });
+                }
+                quizDecks[beeLevel] = data.decks || [];
+
+                renderWords(beeLevel);
+            })
+            .catch(error => {
+                // Forget the failed request so reopening the level retries it
+                delete levelRequests[beeLevel];
+                console.error(`Error loading words for ${beeLevel}:`, error);
+                alert('Error loading words. Please refresh the page.');
+                throw error;
+            });
+    }
+    return levelRequests[beeLevel];
+}
+
+function renderSections() {
+    const container = document.getElementById('sections');
+    container.innerHTML = '';
+
+    levels.forEach(level => {
+        const section = document.createElement('div');
+        section.className = 'bee-section';
+        section.setAttribute('data-section', level.id);
+        section.innerHTML = `
+            <div class="section-header">
+                <h2></h2>
+                <div class="header-actions">
+                    <select class="variant-select" aria-label="Voice for ${level.id}" hidden></select>
+                    <button class="offline-btn" aria-label="Save ${level.id} for offline practice" hidden>Save Offline</button>
+                    <button class="shuffle-btn" aria-label="Shuffle ${level.id} words">Shuffle</button>
+                    <button class="master-reveal-btn" aria-label="Reveal all ${level.id} words">Reveal All</button>
+                    <button class="toggle-btn" aria-label="Expand ${level.id} section">▼</button>
+                </div>
+            </div>
+            <div class="section-content collapsed">
+                <div id="word-list-${level.id}" class="word-list"></div>
+            </div>`;
+        section.querySelector('h2').textContent = level.title;
+        section.querySelector('.master-reveal-btn').setAttribute('data-level', level.id);
+        section.querySelector('.shuffle-btn').setAttribute('data-level', level.id);
+        section.querySelector('.offline-btn').setAttribute('data-level', level.id);
+        renderVariantSelect(section.querySelector('.variant-select'), level);
+        container.appendChild(section);
+    });
+
+    initializeSections();
+}
+
+function renderVariantSelect(select, level) {
+    const variants = level.variants || [];
+    if (!variants.length) return;
+
+    const options = [{ id: '', label: 'Default voice' }, ...variants];
+    options.forEach(variant => {
+        const option = document.createElement('option');
+        option.value = variant.id;
+        option.textContent = variant.label;
+        select.appendChild(option);
+    });
+
+    // A stored variant the level no longer offers falls back to the default
+    const stored = localStorage.getItem(VARIANT_STORAGE_PREFIX + level.id) || '';
+    selectedVariants[level.id] = variants.some(v => v.id === stored) ? stored : '';
+    select.value = selectedVariants[level.id];
+    select.setAttribute('data-level', level.id);
+    select.hidden = false;
+}
+
+function selectVariant(select) {
+    const beeLevel = select.getAttribute('data-level');
+    selectedVariants[beeLevel] = select.value;
+    localStorage.setItem(VARIANT_STORAGE_PREFIX + beeLevel, select.value);
+}
+
+function renderWords(beeLevel, order) {
     const wordList = document.getElementById(`word-list-${beeLevel}`);
     if (!wordList) {
         console.error(`word-list-${beeLevel} element not found`);
@@ -48,7 +139,8 @@ function renderWords(beeLevel) {
     }
     wordList.innerHTML = '';
 
-    const words = wordsData[beeLevel];
+    // `order` is a quiz deck: 0-based word positions, easiest tier first
+    const words = order ? order.map(i => wordsData[beeLevel][i]) : wordsData[beeLevel];
     words.forEach(wordObj => {
         const wordCard = createWordCard(wordObj, beeLevel);
         wordList.appendChild(wordCard);
@@ -60,8 +152,8 @@ function createWordCard(wordObj, beeLevel) {
     card.className = 'word-card';
     card.id = `word-${beeLevel}-${wordObj.id}`;
 
-    // Add special highlight for newly added words in 3B
-    if (beeLevel === '3B' && newWords3B.includes(wordObj.word.toLowerCase())) {
+    // Add special highlight for newly added words
+    if (newWords[beeLevel].includes(wordObj.word.toLowerCase())) {
         card.classList.add('word-card-new');
     }
 
@@ -72,13 +164,21 @@ function createWordCard(wordObj, beeLevel) {
     wordNumber.className = 'word-number';
     wordNumber.textContent = `${wordObj.id}`;
 
+    if (wordObj.difficulty) {
+        const difficulty = document.createElement('span');
+        difficulty.className = 'word-difficulty';
+        difficulty.title = `Difficulty ${wordObj.difficulty} of 5`;
+        difficulty.textContent = '●'.repeat(wordObj.difficulty) + '○'.repeat(5 - wordObj.difficulty);
+        wordNumber.appendChild(difficulty);
+    }
+
     const actions = document.createElement('div');
     actions.className = 'word-actions';
 
     const playBtn = document.createElement('button');
     playBtn.className = 'btn btn-play';
     playBtn.textContent = 'Play';
-    playBtn.onclick = () => playPronunciation(wordObj.word, beeLevel, playBtn);
+    playBtn.onclick = () => playPronunciation(wordObj, beeLevel, playBtn);
 
     const revealBtn = document.createElement('button');
     revealBtn.className = 'btn btn-reveal';
@@ -114,9 +214,51 @@ function createWordCard(wordObj, beeLevel) {
     return card;
 }
 
-function playPronunciation(word, beeLevel, button) {
-    const audioFileName = sanitizeFileName(word);
-    const audioPath = `audio/${beeLevel}/${audioFileName}.mp3`;
+function preloadBundle(beeLevel) {
+    const bundle = audioBundles[beeLevel];
+    if (!bundle || bundleBuffers[beeLevel] !== undefined) return;
+
+    // Mark as in flight; playback uses individual files until the bundle arrives
+    bundleBuffers[beeLevel] = null;
+    fetch(bundle.url)
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.arrayBuffer();
+        })
+        .then(buffer => {
+            bundleBuffers[beeLevel] = buffer;
+        })
+        .catch(error => {
+            console.error(`Audio bundle for ${beeLevel} unavailable:`, error);
+        });
+}
+
+function audioSource(wordObj, beeLevel) {
+    // Variants are not bundled; each word is its own file under audio/<level>/<variant>/
+    const variant = selectedVariants[beeLevel];
+    if (variant) {
+        return { url: `audio/${beeLevel}/${variant}/${sanitizeFileName(wordObj.word)}.mp3`, isBlob: false };
+    }
+
+    const bundle = audioBundles[beeLevel];
+    const buffer = bundleBuffers[beeLevel];
+
+    if (bundle && buffer) {
+        const offset = bundle.ranges[2 * (wordObj.id - 1)];
+        const length = bundle.ranges[2 * (wordObj.id - 1) + 1];
+        if (length > 0) {
+            const blob = new Blob([buffer.slice(offset, offset + length)], { type: 'audio/mpeg' });
+            return { url: URL.createObjectURL(blob), isBlob: true };
+        }
+    }
+
+    return { url: `audio/${beeLevel}/${sanitizeFileName(wordObj.word)}.mp3`, isBlob: false };
+}
+
+function playPronunciation(wordObj, beeLevel, button) {
+    const word = wordObj.word;
+    const source = audioSource(wordObj, beeLevel);
+    const audioPath = source.url;
 
     const audio = new Audio(audioPath);
 
@@ -124,6 +266,10 @@ function playPronunciation(word, beeLevel, button) {
     const originalText = button.textContent;
     button.textContent = 'Playing...';
 
+    const release = () => {
+        if (source.isBlob) URL.revokeObjectURL(audioPath);
+    };
+
     audio.play().catch(error => {
         console.error(`Audio error for "${word}":`, error);
         button.textContent = 'No Audio';
@@ -134,11 +280,13 @@ function playPronunciation(word, beeLevel, button) {
     });
 
     audio.onended = () => {
+        release();
         button.textContent = originalText;
         button.disabled = false;
     };
 
     audio.onerror = () => {
+        release();
         console.error(`Audio file not found: ${audioPath}`);
         button.textContent = 'No Audio';
         setTimeout(() => {
@@ -148,19 +296,6 @@ function playPronunciation(word, beeLevel, button) {
     };
 }
 
-function sanitizeFileName(word) {
-    return word
-        .toLowerCase()
-        .replace(/\s+/g, '_')
-        .replace(/['']/g, '')
-        .replace(/[àâä]/g, 'a')
-        .replace(/[éèêë]/g, 'e')
-        .replace(/[îï]/g, 'i')
-        .replace(/[ôö]/g, 'o')
-        .replace(/[ùûü]/g, 'u')
-        .replace(/[^a-z0-9_]/g, '');
-}
-
 function toggleReveal(beeLevel, wordId, reveal) {
     const wordObj = wordsData[beeLevel].find(w => w.id === wordId);
     if (!wordObj) return;
@@ -182,9 +317,10 @@ function toggleReveal(beeLevel, wordId, reveal) {
 }
 
 function updateStats() {
-    const totalWords = wordsData['1B'].length + wordsData['2B'].length + wordsData['3B'].length;
+    const totalWords = levels.reduce((sum, level) => sum + level.count, 0);
+    const perLevel = levels.map(level => `${level.id}: ${level.count}`).join(', ');
     const wordCount = document.getElementById('word-count');
-    wordCount.textContent = `${totalWords} words total (1B: ${wordsData['1B'].length}, 2B: ${wordsData['2B'].length}, 3B: ${wordsData['3B'].length})`;
+    wordCount.textContent = `${totalWords} words total (${perLevel})`;
 }
 
 function initializeSections() {
@@ -195,6 +331,9 @@ function initializeSections() {
         const toggleBtn = section.querySelector('.toggle-btn');
         const content = section.querySelector('.section-content');
         const masterRevealBtn = section.querySelector('.master-reveal-btn');
+        const shuffleBtn = section.querySelector('.shuffle-btn');
+        const offlineBtn = section.querySelector('.offline-btn');
+        const variantSelect = section.querySelector('.variant-select');
 
         // Click anywhere on header to expand/collapse
         header.addEventListener('click', () => {
@@ -203,6 +342,8 @@ function initializeSections() {
             if (isCollapsed) {
                 content.classList.remove('collapsed');
                 toggleBtn.classList.add('expanded');
+                const beeLevel = section.getAttribute('data-section');
+                loadLevel(beeLevel).then(() => preloadBundle(beeLevel), () => {});
             } else {
                 content.classList.add('collapsed');
                 toggleBtn.classList.remove('expanded');
@@ -214,13 +355,59 @@ function initializeSections() {
             e.stopPropagation();
             toggleMasterReveal(masterRevealBtn);
         });
+
+        shuffleBtn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            shuffleLevel(shuffleBtn, masterRevealBtn, section);
+        });
+
+        offlineBtn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            saveLevelOffline(offlineBtn);
+        });
+
+        variantSelect.addEventListener('click', (e) => e.stopPropagation());
+        variantSelect.addEventListener('change', () => selectVariant(variantSelect));
     });
 }
 
-function toggleMasterReveal(button) {
+async function shuffleLevel(button, masterRevealBtn, section) {
+    const beeLevel = button.getAttribute('data-level');
+
+    try {
+        await loadLevel(beeLevel);
+    } catch (error) {
+        return;
+    }
+
+    // Decks were shuffled at build time; step to the next one
+    const decks = quizDecks[beeLevel];
+    if (!decks.length) return;
+    const position = deckPositions[beeLevel] === undefined ? 0 : (deckPositions[beeLevel] + 1) % decks.length;
+    deckPositions[beeLevel] = position;
+
+    renderWords(beeLevel, decks[position]);
+    masterRevealBtn.textContent = 'Reveal All';
+
+    const content = section.querySelector('.section-content');
+    if (content.classList.contains('collapsed')) {
+        content.classList.remove('collapsed');
+        section.querySelector('.toggle-btn').classList.add('expanded');
+        preloadBundle(beeLevel);
+    }
+}
+
+async function toggleMasterReveal(button) {
     const beeLevel = button.getAttribute('data-level');
     const isRevealing = button.textContent === 'Reveal All';
 
+    // The level's words may not have been opened yet
+    try {
+        await loadLevel(beeLevel);
+    } catch (error) {
+        return;
+    }
+
     // Get all word cards for this level
     const wordList = document.getElementById(`word-list-${beeLevel}`);
     const wordCards = wordList.querySelectorAll('.word-card');
@@ -251,6 +438,62 @@ function toggleMasterReveal(button) {
     button.textContent = isRevealing ? 'Hide All' : 'Reveal All';
 }
 
+function offlineButton(beeLevel) {
+    return document.querySelector(`.offline-btn[data-level="${beeLevel}"]`);
+}
+
+function saveLevelOffline(button) {
+    const controller = navigator.serviceWorker.controller;
+    if (!controller) return;
+
+    // The service worker downloads the level in the background and reports progress
+    button.disabled = true;
+    button.textContent = 'Saving...';
+    controller.postMessage({ type: 'prefetch', level: button.getAttribute('data-level') });
+}
+
+function handleServiceWorkerMessage(event) {
+    const { type, level } = event.data || {};
+
+    if (type === 'status') {
+        Object.entries(event.data.levels).forEach(([id, entry]) => {
+            const button = offlineButton(id);
+            if (!button) return;
+            button.hidden = false;
+            button.title = `${(entry.size / 1048576).toFixed(1)} MB`;
+            if (entry.saved) {
+                button.textContent = 'Saved ✓';
+                button.disabled = true;
+            }
+        });
+        return;
+    }
+
+    const button = offlineButton(level);
+    if (!button) return;
+    if (type === 'prefetch-progress') {
+        button.textContent = `Saving ${Math.floor(100 * event.data.done / event.data.total)}%`;
+    } else if (type === 'prefetch-done') {
+        button.textContent = 'Saved ✓';
+    } else if (type === 'prefetch-failed') {
+        button.textContent = 'Save Offline';
+        button.disabled = false;
+    }
+}
+
+function initializeServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+
+    navigator.serviceWorker.addEventListener('message', handleServiceWorkerMessage);
+    navigator.serviceWorker.register('sw.js')
+        .then(() => navigator.serviceWorker.ready)
+        .then(registration => {
+            // Pick up files changed by a new build; the reply lists levels saved offline
+            registration.active.postMessage({ type: 'update' });
+        })
+        .catch(error => console.error('Service worker registration failed:', error));
+}
+
 function initializeThemeToggle() {
     const themeToggleBtn = document.getElementById('theme-toggle');
     const themeIcon = themeToggleBtn.querySelector('.theme-icon');
@@ -275,7 +518,7 @@ function initializeThemeToggle() {
 }
 
 document.addEventListener('DOMContentLoaded', () => {
-    initializeSections();
     initializeThemeToggle();
-    loadWords();
+    loadLevels();
+    initializeServiceWorker();
 });
@@ -0,0 +1,23 @@
+// ABOUTME: Filename sanitizer shared with the Python build - generated by filenames.py
+// ABOUTME: Do not edit; change filename_rules.json and run `python filenames.py --write-js`
+
+const FILENAME_RULES = {"separator": "_", "fold": {"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "đ": "d", "ð": "d", "ł": "l", "þ": "th", "ı": "i"}, "allowed": "abcdefghijklmnopqrstuvwxyz0123456789_"};
+const FILENAME_ALLOWED = new Set("0123456789_abcdefghijklmnopqrstuvwxyz");
+
+function sanitizeFileName(word) {
+    const decomposed = word.toLowerCase().normalize('NFKD');
+    const joined = decomposed.split(/\s+/).filter(Boolean).join(FILENAME_RULES.separator);
+    let result = '';
+    for (const char of joined) {
+        if (FILENAME_ALLOWED.has(char)) {
+            result += char;
+        } else if (Object.prototype.hasOwnProperty.call(FILENAME_RULES.fold, char)) {
+            result += FILENAME_RULES.fold[char];
+        }
+    }
+    return result;
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { sanitizeFileName };
+}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# ABOUTME: Loads the bee level registry (levels.json) shared by the generator and the web app
+# ABOUTME: Expands each entry into the source, JSON and audio paths used by the build, including voice variants
+
+import json
+from pathlib import Path
+
+REGISTRY_FILE = 'levels.json'
+
+# TTS request settings a variant may override
+VARIANT_FIELDS = ('voice', 'speed', 'instructions')
+
+
+def variant_key(level, variant):
+    """Audio cache and metrics key of one level's variant, e.g. "1B/slow"."""
+    return f"{level}/{variant}"
+
+
+def _load_variants(registry):
+    """Validate the registry's top-level "variants" definitions."""
+    variants = {}
+    for variant_id, definition in registry.get('variants', {}).items():
+        unknown = set(definition) - set(VARIANT_FIELDS) - {'label'}
+        if unknown or not variant_id or '/' in variant_id:
+            raise ValueError(f"invalid variant '{variant_id}' in {REGISTRY_FILE}: "
+                             f"use an id without '/' and only {', '.join(VARIANT_FIELDS)} and label")
+        variants[variant_id] = definition
+    return variants
+
+
+def load_levels(project_root):
+    """
+    Read levels.json and return one bee config dict per level.
+
+    Each registry entry needs an "id", "title" and "source" word file; the
+    optional "highlight" names a words JSON whose entries the app marks as
+    new, and the optional "backend" picks the TTS engine (see tts_backends).
+    Output paths follow the level id: data/words_<id>.json and
+    audio/<id>/.
+
+    An entry's optional "variants" lists ids from the registry's top-level
+    "variants" map, each overriding voice, speed and/or instructions. A
+    variant's audio goes to audio/<id>/<variant>/.
+    """
+    project_root = Path(project_root)
+    with open(project_root / REGISTRY_FILE, 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+    definitions = _load_variants(registry)
+
+    configs = []
+    for entry in registry['levels']:
+        level = entry['id']
+        config = {
+            'level': level,
+            'title': entry.get('title', level),
+            'source_file': project_root / entry['source'],
+            'json_file': project_root / 'data' / f"words_{level}.json",
+            'audio_dir': project_root / 'audio' / level,
+        }
+        if entry.get('highlight'):
+            config['highlight_file'] = project_root / entry['highlight']
+        if entry.get('backend'):
+            config['backend'] = entry['backend']
+
+        config['variants'] = []
+        for variant_id in entry.get('variants', []):
+            if variant_id not in definitions:
+                raise ValueError(f"level {level} uses undefined variant '{variant_id}'")
+            definition = definitions[variant_id]
+            config['variants'].append({
+                'id': variant_id,
+                'key': variant_key(level, variant_id),
+                'label': definition.get('label', variant_id),
+                'settings': {field: definition[field] for field in VARIANT_FIELDS
+                             if field in definition},
+                'audio_dir': config['audio_dir'] / variant_id,
+            })
+        configs.append(config)
+    return configs
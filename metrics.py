@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# ABOUTME: Build metrics: per-word spans, rolling throughput, error classes and estimated TTS cost
+# ABOUTME: Verbosity-filtered console with a live progress bar, exported as JSON lines or Prometheus text
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+QUIET = 0       # errors and final totals only
+NORMAL = 1      # plus level headers, summaries and the progress bar
+VERBOSE = 2     # plus one line per word
+
+# Seconds per synthesized word, filled in by the job runner and the backends
+SPAN_PHASES = ('queue_wait', 'rate_wait', 'request', 'stream', 'backoff', 'total')
+OUTCOMES = ('generated', 'skipped', 'failed')
+
+THROUGHPUT_WINDOW = 10.0    # seconds of completions behind the rolling rate
+PROGRESS_INTERVAL = 0.1     # minimum seconds between progress bar redraws
+PROGRESS_WIDTH = 24
+
+
+def record_phase(span, phase, seconds):
+    """Add `seconds` to one phase of a span; retries accumulate."""
+    if span is not None:
+        span[phase] = span.get(phase, 0.0) + seconds
+
+
+def _percentiles(values):
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": values[-1],
+            "sum": sum(values), "count": len(values)}
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class Console:
+    """
+    Thread-safe console output filtered by verbosity.
+
+    Per-word lines are `detail` and only shown at VERBOSE; at NORMAL a
+    progress bar on stderr (when it is a terminal) takes their place.
+    Lines printed while the bar is up clear it first and redraw it after.
+    """
+
+    def __init__(self, verbosity=NORMAL):
+        self.verbosity = verbosity
+        self._lock = threading.RLock()
+        self._metrics = None
+        self._total = 0
+        self._drawn = 0.0
+
+    def _emit(self, message):
+        with self._lock:
+            self._clear()
+            print(message)
+            if self._metrics is not None:
+                self._draw()
+
+    def error(self, message):
+        self._emit(message)
+
+    def info(self, message):
+        if self.verbosity >= NORMAL:
+            self._emit(message)
+
+    def detail(self, message):
+        if self.verbosity >= VERBOSE:
+            self._emit(message)
+
+    def start_progress(self, metrics, total):
+        """Show a progress bar for `total` words until stop_progress()."""
+        if self.verbosity != NORMAL or not total or not sys.stderr.isatty():
+            return
+        with self._lock:
+            self._metrics = metrics
+            self._total = total
+            metrics.progress = self
+            self._draw()
+
+    def refresh(self):
+        """Redraw the progress bar, at most every PROGRESS_INTERVAL seconds."""
+        if self._metrics is None or time.monotonic() - self._drawn < PROGRESS_INTERVAL:
+            return
+        with self._lock:
+            if self._metrics is not None:
+                self._draw()
+
+    def stop_progress(self):
+        with self._lock:
+            if self._metrics is not None:
+                self._draw()
+                sys.stderr.write('\n')
+                sys.stderr.flush()
+                self._metrics.progress = None
+                self._metrics = None
+
+    def _clear(self):
+        if self._metrics is not None:
+            sys.stderr.write('\r\x1b[K')
+            sys.stderr.flush()
+
+    def _draw(self):
+        self._drawn = time.monotonic()
+        done = min(self._metrics.processed, self._total)
+        filled = PROGRESS_WIDTH * done // self._total
+        rate = self._metrics.throughput()
+        eta = _format_duration((self._total - done) / rate) if rate else '--:--'
+        line = (f"  [{'█' * filled}{'░' * (PROGRESS_WIDTH - filled)}] "
+                f"{done:,}/{self._total:,} {100 * done // self._total:3d}%  "
+                f"{rate:6.1f} words/s  ETA {eta}")
+        failed = self._metrics.outcomes['failed']
+        if failed:
+            line += f"  ❌ {failed}"
+        sys.stderr.write(f"\r{line}\x1b[K")
+        sys.stderr.flush()
+
+
+# Shared by every module that reports progress
+console = Console()
+
+
+class BuildMetrics:
+    """
+    Counters and per-word spans for one build, shared by every level worker.
+
+    A span covers one synthesis job: time queued for a worker, waiting on
+    the rate limiter, the request until response headers, streaming the
+    body to disk, sleeping between retries, and the total. Spans are
+    streamed to `export_path` as JSON lines, or the totals are written as
+    a Prometheus text file on close() when the path ends in ".prom".
+    """
+
+    def __init__(self, export_path=None):
+        self.started = time.monotonic()
+        self.levels = {}                # level -> Counter of outcomes
+        self.outcomes = Counter()
+        self.processed = 0
+        self.attempts = 0
+        self.errors = Counter()         # every failed attempt, by error class
+        self.failures = Counter()       # words that gave up, by final error class
+        self.characters = 0
+        self.cost = 0.0
+        self.unpriced = 0               # generated words whose model has no known price
+        self.phases = {phase: [] for phase in SPAN_PHASES}
+        self.progress = None
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+        self.export_path = Path(export_path) if export_path else None
+        self._file = None
+        if self.export_path and self.export_path.suffix != '.prom':
+            self.export_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.export_path, 'w', encoding='utf-8')
+
+    def word(self, level, outcome, count=1):
+        """Count `count` words of `level` as generated, skipped or failed."""
+        now = time.monotonic()
+        with self._lock:
+            self.levels.setdefault(level, Counter())[outcome] += count
+            self.outcomes[outcome] += count
+            self.processed += count
+            self._recent.extend([now] * count)
+        if self.progress is not None:
+            self.progress.refresh()
+
+    def span(self, level, job, error=None, price=0.0):
+        """
+        Record a finished synthesis job.
+
+        Args:
+            level: Level that ran the job
+            job: Job dict whose 'span' the runner and backend filled in
+            error: The job's final error, or None
+            price: Backend price in dollars per million characters (None if unknown)
+        """
+        span = job['span']
+        finished = time.perf_counter()
+        span['total'] = finished - span['queued']
+        span['queue_wait'] = span.get('started', finished) - span['queued']
+        errors = span.get('errors', [])
+        # The text sent, which for an overridden word is its respelling or carrier sentence
+        chars = len(job['text']) if error is None else 0
+
+        with self._lock:
+            self.attempts += span.get('attempts', 0)
+            self.errors.update(errors)
+            if error is not None:
+                self.failures[errors[-1] if errors else type(error).__name__] += 1
+            self.characters += chars
+            if chars and price is None:
+                self.unpriced += 1
+            elif chars:
+                self.cost += chars * price / 1_000_000
+            for phase in SPAN_PHASES:
+                if phase in span:
+                    self.phases[phase].append(span[phase])
+
+            if self._file is not None:
+                record = {
+                    "type": "span",
+                    "time": time.time(),
+                    "level": level,
+                    "word": job['word'],
+                    "key": job['key'],
+                    "outcome": "generated" if error is None else "failed",
+                    "attempts": span.get('attempts', 0),
+                    "errors": errors,
+                    "error": None if error is None else str(error),
+                    "chars": chars,
+                }
+                record.update({phase: round(span[phase], 6) for phase in SPAN_PHASES
+                               if phase in span})
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def throughput(self):
+        """Words finished per second over the last THROUGHPUT_WINDOW seconds."""
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW:
+                self._recent.popleft()
+            window = min(THROUGHPUT_WINDOW, now - self.started)
+            return len(self._recent) / window if window > 0 else 0.0
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "seconds": round(elapsed, 3),
+                "words": {outcome: self.outcomes[outcome] for outcome in OUTCOMES},
+                "levels": {level: dict(counts) for level, counts in self.levels.items()},
+                "generated_per_second": (round(self.outcomes['generated'] / elapsed, 2)
+                                         if elapsed else None),
+                "attempts": self.attempts,
+                "errors": dict(self.errors.most_common()),
+                "failures": dict(self.failures.most_common()),
+                "characters": self.characters,
+                "estimated_cost": None if self.unpriced else round(self.cost, 4),
+                "phases": {phase: _percentiles(values)
+                           for phase, values in self.phases.items() if values},
+            }
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['attempts']:
+            return
+        print(f"Metrics: {summary['words']['generated']} generated in {summary['seconds']:.1f}s "
+              f"({summary['generated_per_second']:.1f}/s), {summary['attempts']} requests")
+        for phase in SPAN_PHASES:
+            if phase in summary['phases']:
+                stats = summary['phases'][phase]
+                print(f"  {phase:<10} p50 {stats['p50'] * 1000:7.1f}ms  "
+                      f"p95 {stats['p95'] * 1000:7.1f}ms  max {stats['max'] * 1000:7.1f}ms")
+        if summary['errors']:
+            print("  errors: " + ", ".join(f"{name} ×{count}"
+                                           for name, count in summary['errors'].items()))
+        cost = summary['estimated_cost']
+        print(f"  characters: {summary['characters']:,}  estimated cost: "
+              + (f"${cost:.4f}" if cost is not None else "unknown (unpriced model)"))
+
+    def prometheus(self):
+        """The totals in the Prometheus text exposition format."""
+        summary = self.summary()
+        escape = lambda value: str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP spellingbee_{name} {help_text}")
+            lines.append(f"# TYPE spellingbee_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{escape(v)}"' for k, v in labels)
+                lines.append(f"spellingbee_{name}{{{label_text}}} {value}" if label_text
+                             else f"spellingbee_{name} {value}")
+
+        metric('words_total', 'counter', "Words processed, by level and outcome",
+               [((('level', level), ('outcome', outcome)), count)
+                for level, counts in sorted(summary['levels'].items())
+                for outcome, count in sorted(counts.items())])
+        metric('tts_requests_total', 'counter', "TTS requests including retries",
+               [((), summary['attempts'])])
+        metric('tts_errors_total', 'counter', "Failed TTS attempts, by error class",
+               [((('class', name),), count) for name, count in summary['errors'].items()])
+        metric('tts_failures_total', 'counter', "Words that exhausted their retries, by error class",
+               [((('class', name),), count) for name, count in summary['failures'].items()])
+        metric('characters_synthesized_total', 'counter', "Characters of successfully synthesized text",
+               [((), summary['characters'])])
+        if summary['estimated_cost'] is not None:
+            metric('estimated_cost_dollars', 'gauge', "Estimated TTS cost of this build",
+                   [((), summary['estimated_cost'])])
+        metric('build_seconds', 'gauge', "Wall time of the build", [((), summary['seconds'])])
+
+        lines.append("# HELP spellingbee_span_seconds Per-word synthesis time, by phase")
+        lines.append("# TYPE spellingbee_span_seconds summary")
+        for phase, stats in summary['phases'].items():
+            for quantile in ('p50', 'p95', 'p99'):
+                lines.append(f'spellingbee_span_seconds{{phase="{phase}",'
+                             f'quantile="0.{quantile[1:]}"}} {stats[quantile]:.6f}')
+            lines.append(f'spellingbee_span_seconds_sum{{phase="{phase}"}} {stats["sum"]:.6f}')
+            lines.append(f'spellingbee_span_seconds_count{{phase="{phase}"}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        """Finish the export: a summary line for JSON lines, the whole file for Prometheus."""
+        if self.export_path is None:
+            return
+        if self._file is not None:
+            summary = self.summary()
+            with self._lock:
+                self._file.write(json.dumps({"type": "summary", **summary},
+                                            ensure_ascii=False) + '\n')
+                self._file.close()
+                self._file = None
+        else:
+            # Written aside and renamed so a textfile collector never reads half a file
+            self.export_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.export_path.with_name(self.export_path.name + '.tmp')
+            tmp_path.write_text(self.prometheus(), encoding='utf-8')
+            os.replace(tmp_path, self.export_path)
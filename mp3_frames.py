@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# ABOUTME: Walks MPEG audio frame headers without decoding, to validate MP3s and measure their duration
+# ABOUTME: Shared by verify_audio.py and the job journal's check for truncated files
+
+# Bitrates in kbps by [MPEG-1][layer] / [MPEG-2 and 2.5][layer]; index 0 is "free", 15 is invalid
+BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+
+def id3v2_size(data):
+    """Length of a leading ID3v2 tag (header, body and footer), or 0."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_frame_header(data, pos):
+    """
+    Decode the 4-byte MPEG audio frame header at `pos`.
+
+    Returns:
+        (frame_length, samples_per_frame, sample_rate), or None if the bytes
+        are not a valid header.
+    """
+    if pos + 4 > len(data):
+        return None
+    b1, b2 = data[pos + 1], data[pos + 2]
+    if data[pos] != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+
+    version = {0: 2.5, 2: 2, 3: 1}.get((b1 >> 3) & 0x03)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 3 and version != 1:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+
+
+def scan_mp3(data):
+    """
+    Walk every frame header of an MP3 without decoding audio.
+
+    Returns:
+        Dict with frames, duration (seconds), sample_rate and error
+        (None, or a short description of the first problem found).
+    """
+    pos = id3v2_size(data)
+    end = len(data)
+    frames = 0
+    samples = 0
+    sample_rate = None
+    error = None
+
+    while pos < end:
+        header = parse_frame_header(data, pos)
+        if header is None:
+            # Trailing ID3v1 / APE tags are fine; anything else is corruption
+            if data[pos:pos + 3] != b'TAG' and data[pos:pos + 8] != b'APETAGEX':
+                error = "no frame sync" if frames == 0 else f"garbage after frame {frames}"
+            break
+        length, frame_samples, sample_rate = header
+        if pos + length > end:
+            error = f"truncated in frame {frames + 1}"
+            break
+        frames += 1
+        samples += frame_samples
+        pos += length
+
+    if frames == 0 and error is None:
+        error = "no audio frames"
+    return {
+        "frames": frames,
+        "duration": samples / sample_rate if sample_rate else 0.0,
+        "sample_rate": sample_rate,
+        "error": error,
+    }
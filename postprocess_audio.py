@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# ABOUTME: Post-processes generated MP3s: trims silence, normalizes loudness and re-encodes smaller
+# ABOUTME: Runs ffmpeg over audio/<level> in a process pool and records size savings and timings
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from batch_synthesis import find_ffmpeg
+from levels import load_levels
+
+DEFAULT_SETTINGS = {
+    "codec": "mp3",
+    "bitrate": "48k",
+    "sample_rate": 24000,
+    "loudness": -16,
+    "silence_threshold": "-50dB",
+}
+
+STATE_FILE = 'postprocess.json'
+REPORT_FILE = 'postprocess_report.json'
+
+
+def settings_fingerprint(settings):
+    payload = json.dumps(settings, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def build_filter(settings):
+    """Trim leading/trailing silence (via areverse) and normalize loudness."""
+    trim = f"silenceremove=start_periods=1:start_threshold={settings['silence_threshold']}"
+    return f"{trim},areverse,{trim},areverse,loudnorm=I={settings['loudness']}:TP=-1.5:LRA=11"
+
+
+def output_path_for(path, settings):
+    """MP3 is rewritten in place; Opus is written next to the MP3."""
+    if settings['codec'] == 'opus':
+        return path.with_suffix('.opus')
+    return path
+
+
+def process_file(path, settings, ffmpeg):
+    """
+    Process one file. Runs in a worker process.
+
+    The result is written to a temporary file and renamed over the target,
+    which also detaches it from any hardlinked cache blob.
+
+    Returns:
+        Dict with the file, sizes before/after, elapsed seconds and error.
+    """
+    start = time.perf_counter()
+    target = output_path_for(path, settings)
+    tmp_path = target.with_name(target.name + '.tmp')
+    before = path.stat().st_size
+
+    if settings['codec'] == 'opus':
+        codec = ['-codec:a', 'libopus', '-b:a', settings['bitrate'], '-f', 'ogg']
+    else:
+        codec = ['-codec:a', 'libmp3lame', '-b:a', settings['bitrate'], '-f', 'mp3']
+
+    try:
+        subprocess.run(
+            [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-i', str(path),
+             '-af', build_filter(settings), '-ac', '1', '-ar', str(settings['sample_rate']),
+             '-map_metadata', '-1', *codec, str(tmp_path)],
+            check=True, capture_output=True
+        )
+        os.replace(tmp_path, target)
+        error = None
+    except (OSError, subprocess.CalledProcessError) as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        stderr = getattr(e, 'stderr', b'') or b''
+        error = stderr.decode('utf-8', 'replace').strip() or str(e)
+
+    stat = target.stat() if error is None else None
+    return {
+        "file": str(path),
+        "before": before,
+        "after": stat.st_size if stat else before,
+        "mtime_ns": stat.st_mtime_ns if stat else None,
+        "seconds": time.perf_counter() - start,
+        "error": error,
+    }
+
+
+def _load_state(state_path):
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def _save_json(data, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def is_processed(path, settings, record):
+    """True when `path` was produced by this pass with the same settings."""
+    if not record or record['settings'] != settings_fingerprint(settings):
+        return False
+    try:
+        stat = output_path_for(path, settings).stat()
+    except FileNotFoundError:
+        return False
+    return stat.st_size == record['size'] and stat.st_mtime_ns == record['mtime_ns']
+
+
+def postprocess_levels(audio_dirs, state_dir, settings=None, workers=None):
+    """
+    Post-process every MP3 under `audio_dirs` that is not already processed.
+
+    Args:
+        audio_dirs: Level directories such as audio/1B
+        state_dir: Where the incremental state and timing report are kept
+        settings: Overrides for DEFAULT_SETTINGS
+        workers: Process count (defaults to all cores)
+
+    Returns:
+        Summary dict, or None when ffmpeg is not installed.
+    """
+    settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+    ffmpeg = find_ffmpeg()
+    if ffmpeg is None:
+        print("⚠️  ffmpeg not found - skipping audio post-processing")
+        return None
+
+    state_path = state_dir / STATE_FILE
+    state = _load_state(state_path)
+
+    todo = []
+    skipped = 0
+    for audio_dir in audio_dirs:
+        for path in sorted(audio_dir.glob('*.mp3')):
+            if is_processed(path, settings, state.get(str(path))):
+                skipped += 1
+            else:
+                todo.append(path)
+
+    print(f"\n{'='*70}")
+    print(f"Post-processing {len(todo)} files ({skipped} already done) "
+          f"→ {settings['codec']} {settings['bitrate']} mono")
+    print(f"{'='*70}\n")
+
+    results = []
+    start = time.perf_counter()
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(process_file, path, settings, ffmpeg) for path in todo]
+            for future in futures:
+                result = future.result()
+                results.append(result)
+                name = Path(result['file']).name
+                if result['error']:
+                    print(f"❌ {name}: {result['error']}")
+                    continue
+                state[result['file']] = {
+                    "settings": settings_fingerprint(settings),
+                    "size": result['after'],
+                    "mtime_ns": result['mtime_ns'],
+                }
+                saved = 100 * (1 - result['after'] / result['before']) if result['before'] else 0
+                print(f"✂️  {name}: {result['before'] / 1024:.1f} KB → "
+                      f"{result['after'] / 1024:.1f} KB ({saved:.0f}% smaller, {result['seconds']:.2f}s)")
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if not r['error']]
+    before = sum(r['before'] for r in ok)
+    after = sum(r['after'] for r in ok)
+    summary = {
+        "settings": settings,
+        "processed": len(ok),
+        "skipped": skipped,
+        "failed": len(results) - len(ok),
+        "bytes_before": before,
+        "bytes_after": after,
+        "wall_seconds": elapsed,
+        "cpu_seconds": sum(r['seconds'] for r in results),
+        "files": results,
+    }
+
+    _save_json(state, state_path)
+    _save_json(summary, state_dir / REPORT_FILE)
+
+    print("\nPost-processing Summary:")
+    print(f"  ✂️  Processed: {len(ok)}")
+    print(f"  ⏭️  Skipped:   {skipped}")
+    print(f"  ❌ Failed:    {summary['failed']}")
+    if before:
+        print(f"  💾 Size:      {before / 1024 / 1024:.2f} MB → {after / 1024 / 1024:.2f} MB "
+              f"({100 * (1 - after / before):.0f}% smaller)")
+    print(f"  ⏱️  Time:      {elapsed:.1f}s wall, {summary['cpu_seconds']:.1f}s across workers")
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim, normalize and re-encode generated audio")
+    parser.add_argument('levels', nargs='*', help="level ids (default: every level in levels.json)")
+    parser.add_argument('--codec', choices=['mp3', 'opus'], default=DEFAULT_SETTINGS['codec'],
+                        help="mp3 rewrites files in place; opus writes .opus files alongside")
+    parser.add_argument('--bitrate', default=DEFAULT_SETTINGS['bitrate'])
+    parser.add_argument('--workers', type=int, default=None, help="default: all cores")
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent
+    levels = args.levels or [config['level'] for config in load_levels(project_root)]
+    summary = postprocess_levels(
+        [project_root / 'audio' / level for level in levels],
+        project_root / '.audio_cache',
+        settings={"codec": args.codec, "bitrate": args.bitrate},
+        workers=args.workers
+    )
+    if summary is None or summary['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
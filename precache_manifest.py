@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# ABOUTME: Writes precache-manifest.json: every file the app fetches, with content revision and size
+# ABOUTME: Grouped into an app shell and per-level audio for the service worker; rehashes only changed files
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from filenames import sanitize_filename
+from word_index import current_index, read_words_json
+
+PRECACHE_FILE = 'precache-manifest.json'
+PRECACHE_VERSION = 2
+STATE_FILE = 'precache.json'
+REVISION_LENGTH = 16
+
+# Always cached: the page and its scripts and styles. The word index and
+# every level's word file are added from index.html.
+SHELL_FILES = ('index.html', 'css/style.css', 'js/filename_rules.js', 'js/app.js')
+
+
+def load_state(path):
+    """Previously hashed files: relative path -> [size, mtime_ns, revision]."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(state, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_entry(site_root, url, state, seen):
+    """
+    `[url, revision, size]` for one file, or None if it does not exist.
+
+    The revision is a prefix of the file's SHA-256. Files whose size and
+    mtime match the previous run reuse the recorded revision unread.
+    """
+    try:
+        stat = (site_root / url).stat()
+    except FileNotFoundError:
+        return None
+
+    seen.add(url)
+    known = state.get(url)
+    if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+        return [url, known[2], stat.st_size]
+
+    digest = hashlib.sha256()
+    with open(site_root / url, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    revision = digest.hexdigest()[:REVISION_LENGTH]
+    state[url] = [stat.st_size, stat.st_mtime_ns, revision]
+    return [url, revision, stat.st_size]
+
+
+def shell_urls(site_root):
+    """
+    The app shell: SHELL_FILES, the word index index.html points at, and
+    every level's word file listed in it.
+
+    Returns:
+        (urls, levels_by_id): the shell URLs and the index's level entries
+    """
+    urls = list(SHELL_FILES)
+    index_url = current_index(site_root / 'index.html')
+    levels_by_id = {}
+    if index_url and (site_root / index_url).exists():
+        urls.append(index_url)
+        with open(site_root / index_url, 'r', encoding='utf-8') as f:
+            levels_by_id = {level['id']: level for level in json.load(f)['levels']}
+        urls.extend(level['url'] for level in levels_by_id.values())
+    return urls, levels_by_id
+
+
+def precache_is_current(site_root, state_path, extra=()):
+    """
+    Whether a build that changed no audio can leave the manifest alone.
+
+    True when the manifest exists and neither a shell file nor any path in
+    `extra` was modified since the last update_precache_manifest. Only the
+    shell is stat()ed, so the check costs the same however many MP3s the
+    levels hold; audio edited by hand needs `python precache_manifest.py`.
+    """
+    try:
+        updated = state_path.stat().st_mtime_ns
+        (site_root / PRECACHE_FILE).stat()
+        return all(path.stat().st_mtime_ns < updated
+                   for path in [*(site_root / url for url in shell_urls(site_root)[0]), *extra])
+    except FileNotFoundError:
+        return False
+
+
+def build_precache_manifest(site_root, configs, state):
+    """
+    Describe everything the service worker may cache.
+
+    Args:
+        site_root: Directory holding index.html
+        configs: Bee configs from levels.load_levels, in display order
+        state: Revision memo from load_state (updated in place)
+
+    Returns:
+        Manifest dict: "shell" files cached on install, and per level the
+        "files" saving it downloads (the audio bundle, variant MP3s and any
+        MP3 the bundle lacks) with their total size. The level's own MP3s
+        that the bundle holds are listed under "bundled" as
+        `[url, revision, size, offset]` instead: the service worker cuts
+        them out of the cached bundle rather than downloading them twice.
+    """
+    seen = set()
+    entry = lambda url: file_entry(site_root, url, state, seen)
+
+    shell, levels_by_id = shell_urls(site_root)
+
+    levels = {}
+    for config in configs:
+        level = config['level']
+        words = read_words_json(config['json_file'])
+        files = []
+        slices = {}
+        bundle = None
+        if level in levels_by_id:
+            with open(site_root / levels_by_id[level]['url'], 'r', encoding='utf-8') as f:
+                bundle = json.load(f).get('bundle')
+        bundle_entry = entry(bundle['url']) if bundle else None
+        if bundle_entry is not None:
+            files.append(bundle_entry)
+            # Ranges are [offset, length] pairs in word order; (0, 0) marks a word without audio
+            ranges = bundle['ranges']
+            for i, word in enumerate(words[:len(ranges) // 2]):
+                if ranges[2 * i + 1]:
+                    slices.setdefault(sanitize_filename(word), (ranges[2 * i], ranges[2 * i + 1]))
+
+        filenames = dict.fromkeys(sanitize_filename(word) for word in words)
+        bundled = []
+        audio_dir = config['audio_dir'].relative_to(site_root).as_posix()
+        for filename in filenames:
+            e = entry(f"{audio_dir}/{filename}.mp3")
+            if e is None:
+                continue
+            offset, length = slices.get(filename, (0, 0))
+            # A bundle older than the file would serve the wrong bytes; download those
+            if length == e[2]:
+                bundled.append(e + [offset])
+            else:
+                files.append(e)
+        # Saving a level offline keeps every voice the app can switch to
+        for variant in config.get('variants', []):
+            variant_dir = variant['audio_dir'].relative_to(site_root).as_posix()
+            files.extend(e for e in (entry(f"{variant_dir}/{filename}.mp3") for filename in filenames)
+                         if e is not None)
+
+        levels[level] = {"size": sum(size for _, _, size in files), "files": files}
+        if bundled:
+            levels[level]["bundle"] = bundle_entry[0]
+            levels[level]["bundled"] = bundled
+
+    manifest = {
+        "v": PRECACHE_VERSION,
+        "shell": [e for e in map(entry, shell) if e is not None],
+        "levels": levels,
+    }
+    # Forget files that are no longer listed
+    for url in list(state):
+        if url not in seen:
+            del state[url]
+
+    # Lets the service worker tell at a glance whether anything changed
+    content = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    manifest["revision"] = hashlib.sha256(content).hexdigest()[:REVISION_LENGTH]
+    return manifest
+
+
+def update_precache_manifest(site_root, configs, state_path):
+    """
+    Rebuild `precache-manifest.json` next to index.html, rewriting it only
+    when its content changed.
+
+    Returns:
+        (manifest path, True if the file was rewritten)
+    """
+    state = load_state(state_path)
+    manifest = build_precache_manifest(site_root, configs, state)
+    save_state(state, state_path)
+
+    path = site_root / PRECACHE_FILE
+    content = json.dumps(manifest, separators=(',', ':'))
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return path, False
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+    return path, True
+
+
+def main():
+    """Refresh the precache manifest after bundles or the word index were rebuilt by hand."""
+    from levels import load_levels
+
+    project_root = Path(__file__).parent
+    configs = load_levels(project_root)
+    path, changed = update_precache_manifest(project_root, configs,
+                                             project_root / '.audio_cache' / STATE_FILE)
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"{path.name}: {'updated' if changed else 'up to date'} "
+          f"(revision {manifest['revision']})")
+    for level, entry in manifest['levels'].items():
+        bundled = f" (+{len(entry['bundled'])} served from the bundle)" if 'bundled' in entry else ""
+        print(f"  {level}: {len(entry['files'])} files{bundled}, {entry['size'] / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# ABOUTME: Pronunciation overrides from pronunciations.json: respellings, part-of-speech hints and carrier sentences
+# ABOUTME: Indexed in memory by normalized word; an override is hashed into its word's cache key so only that word regenerates
+
+import hashlib
+import json
+from pathlib import Path
+
+from audio_cache import normalize_word
+
+OVERRIDES_FILE = 'pronunciations.json'
+
+# respell: text spoken instead of the word ("sluff" for "slough")
+# pos: part of speech passed to the TTS model as an instruction ("verb" for "close")
+# carrier: sentence spoken instead, with {word} standing for the (respelled) word
+OVERRIDE_FIELDS = ('respell', 'pos', 'carrier')
+
+
+class PronunciationIndex:
+    """
+    Overrides keyed by normalized word (NFC, collapsed whitespace,
+    casefolded, as in cache keys), so a lookup is one dict access however
+    large the dictionary is and however the source list capitalizes a word.
+    """
+
+    def __init__(self, overrides=None):
+        self._index = {}
+        for word, override in (overrides or {}).items():
+            if not isinstance(override, dict) or not override:
+                raise ValueError(f"override for '{word}' in {OVERRIDES_FILE} must be a non-empty object")
+            unknown = set(override) - set(OVERRIDE_FIELDS)
+            if unknown:
+                raise ValueError(f"override for '{word}' in {OVERRIDES_FILE} has unknown "
+                                 f"{', '.join(sorted(unknown))}: use {', '.join(OVERRIDE_FIELDS)}")
+            if 'carrier' in override and '{word}' not in override['carrier']:
+                raise ValueError(f"carrier sentence for '{word}' in {OVERRIDES_FILE} needs {{word}}")
+            key = normalize_word(word)
+            if key in self._index:
+                raise ValueError(f"'{word}' is listed twice in {OVERRIDES_FILE}")
+            self._index[key] = {field: override[field] for field in OVERRIDE_FIELDS
+                                if field in override}
+
+        # Recorded per level by the build plan; None keeps manifests of builds without overrides valid
+        self.fingerprint = None
+        if self._index:
+            payload = json.dumps(self._index, sort_keys=True, ensure_ascii=False)
+            self.fingerprint = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        return len(self._index)
+
+    def lookup(self, word):
+        """The override for `word`, or None."""
+        return self._index.get(normalize_word(word))
+
+
+def synthesis_input(word, override):
+    """
+    What to send the TTS engine for `word`.
+
+    Returns:
+        (text, instructions): the text to speak, and a part-of-speech
+        instruction for engines that accept one (None without a hint).
+    """
+    if override is None:
+        return word, None
+    text = override.get('respell', word)
+    if 'carrier' in override:
+        text = override['carrier'].replace('{word}', text)
+    instructions = None
+    if 'pos' in override:
+        instructions = f'Pronounce "{word}" as the {override["pos"]}.'
+    return text, instructions
+
+
+def load_pronunciations(project_root):
+    """Read `pronunciations.json` into an index; an empty index when there is none."""
+    try:
+        with open(Path(project_root) / OVERRIDES_FILE, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return PronunciationIndex()
+    return PronunciationIndex(overrides.get('words', {}))
+
+
+def main():
+    """List each override with the levels whose words it affects, and flag unused ones."""
+    from levels import load_levels
+    from word_index import read_words_json
+
+    project_root = Path(__file__).parent
+    index = load_pronunciations(project_root)
+    used = {}
+    for config in load_levels(project_root):
+        for word in read_words_json(config['json_file']):
+            if index.lookup(word) is not None:
+                used.setdefault(normalize_word(word), (word, []))[1].append(config['level'])
+
+    print(f"{OVERRIDES_FILE}: {len(index)} overrides")
+    for word, levels in used.values():
+        text, instructions = synthesis_input(word, index.lookup(word))
+        hint = f"  [{instructions}]" if instructions else ""
+        print(f"  {word} ({', '.join(levels)}): \"{text}\"{hint}")
+    unused = len(index) - len(used)
+    if unused:
+        print(f"  ⚠️  {unused} overrides match no word in any level")
+
+
+if __name__ == '__main__':
+    main()
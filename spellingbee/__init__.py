@@ -0,0 +1,2 @@
+# ABOUTME: Command-line entry point for the SpellingBee build tools (python -m spellingbee)
+# ABOUTME: Kept empty of imports so starting any subcommand costs only what that subcommand needs
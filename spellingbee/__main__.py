@@ -0,0 +1,6 @@
+# ABOUTME: Runs the spellingbee CLI: python -m spellingbee build|plan|verify|bench
+# ABOUTME: See spellingbee/cli.py for the subcommands
+
+from spellingbee.cli import main
+
+main()
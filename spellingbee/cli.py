@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# ABOUTME: One entry point for the build tools: build, plan, verify and bench subcommands
+# ABOUTME: Each subcommand imports its module on demand, so offline commands never load the network stack
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Subcommand -> (module, arguments prepended to the user's, help). Every
+# module keeps its own argparse options; `spellingbee <command> --help`
+# shows them. The modules remain runnable as scripts, and pyproject.toml
+# installs them alongside this package (pip install -e .).
+COMMANDS = {
+    'build': ('generate_all_audio', [], "generate word JSON, audio, bundles and the word index"),
+    'plan': ('generate_all_audio', ['--dry-run'], "print the build plan without changing anything"),
+    'verify': ('verify_words', [], "compare the word files with the image lists "
+                                   "(--audio: validate the generated MP3s instead)"),
+    'bench': ('bench_pipeline', [], "benchmark the generation pipeline"),
+}
+
+
+def load_command(command, args=()):
+    """
+    Import the module behind `command` and return (main, argv).
+
+    Nothing is imported until a command is chosen: the OpenAI SDK and httpx
+    are only loaded by `build` once a level actually needs the API.
+    """
+    module_name, prefix, _ = COMMANDS[command]
+    args = list(args)
+    if command == 'verify' and '--audio' in args:
+        args.remove('--audio')
+        module_name = 'verify_audio'
+    if command == 'bench':
+        return run_benchmark, prefix + args
+
+    module = importlib.import_module(module_name)
+    return module.main, prefix + args
+
+
+def run_benchmark(argv, prog=None):
+    """
+    Run benchmarks/bench_pipeline.py with `argv`.
+
+    The benchmarks are tooling of a source checkout rather than part of the
+    installed modules, so the script runs as it would from the shell.
+    """
+    import subprocess
+
+    script = PROJECT_ROOT / 'benchmarks' / 'bench_pipeline.py'
+    if not script.exists():
+        sys.exit(f"{prog or 'bench'}: needs a source checkout ({script} not found)")
+    sys.exit(subprocess.run([sys.executable, str(script), *argv]).returncode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='spellingbee',
+        description="SpellingBee build tools",
+        epilog="\n".join(f"  {name:<8} {help_text}" for name, (_, _, help_text) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='command',
+                        help=f"one of {', '.join(COMMANDS)}")
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help="options for the command (see spellingbee <command> --help)")
+    args = parser.parse_args(argv)
+
+    command_main, command_args = load_command(args.command, args.args)
+    command_main(command_args, prog=f"spellingbee {args.command}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+// ABOUTME: Service worker that serves the app, word lists and audio from Cache Storage for offline practice
+// ABOUTME: Caches files by the revisions in precache-manifest.json, refreshes only changed ones, prefetches levels on request
+
+const MANIFEST_URL = 'precache-manifest.json';
+const CACHE_NAME = 'spellingbee-precache';
+const SAVED_LEVELS_KEY = '__saved-levels';
+const PREFETCH_CONCURRENCY = 6;
+
+// Current manifest plus a lookup of absolute URL -> revision, and of each
+// bundled MP3's absolute URL -> where it sits in its level's bundle
+let manifest = null;
+let revisions = new Map();
+let slices = new Map();
+
+function absolute(url) {
+    return new URL(url, self.registration.scope).href;
+}
+
+// Each revision of a file is its own cache entry, so a changed file never serves stale bytes
+function cacheKey(url, revision) {
+    return `${absolute(url)}?__rev=${revision}`;
+}
+
+function useManifest(data) {
+    manifest = data;
+    revisions = new Map();
+    slices = new Map();
+    const files = [...data.shell, ...Object.values(data.levels).flatMap(level => level.files)];
+    files.forEach(([url, revision]) => revisions.set(absolute(url), revision));
+    Object.values(data.levels).forEach(level => {
+        (level.bundled || []).forEach(([url, revision, size, offset]) => {
+            revisions.set(absolute(url), revision);
+            slices.set(absolute(url), { bundle: absolute(level.bundle), offset, size });
+        });
+    });
+}
+
+async function currentManifest() {
+    if (!manifest) {
+        const cache = await caches.open(CACHE_NAME);
+        const cached = await cache.match(absolute(MANIFEST_URL));
+        if (cached) useManifest(await cached.json());
+    }
+    return manifest;
+}
+
+async function savedLevels(cache) {
+    const saved = await cache.match(absolute(SAVED_LEVELS_KEY));
+    return saved ? saved.json() : [];
+}
+
+async function cacheFiles(cache, files, onProgress) {
+    let done = 0;
+    const queue = [...files];
+
+    const worker = async () => {
+        while (queue.length) {
+            const [url, revision] = queue.shift();
+            const key = cacheKey(url, revision);
+            if (!(await cache.match(key))) {
+                const response = await fetch(absolute(url), { cache: 'no-cache' });
+                if (!response.ok) throw new Error(`HTTP ${response.status} for ${url}`);
+                await cache.put(key, response);
+            }
+            done += 1;
+            if (onProgress) onProgress(done, files.length);
+        }
+    };
+    await Promise.all(Array.from({ length: PREFETCH_CONCURRENCY }, worker));
+}
+
+// Fetch the manifest, cache new or changed files, then drop revisions it no longer lists
+async function update() {
+    const response = await fetch(absolute(MANIFEST_URL), { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`HTTP ${response.status} for ${MANIFEST_URL}`);
+    const latest = await response.json();
+    const cache = await caches.open(CACHE_NAME);
+
+    // Nothing changed since the last build
+    if ((await currentManifest()) && manifest.revision === latest.revision) return;
+
+    const saved = await savedLevels(cache);
+    const wanted = [...latest.shell];
+    saved.forEach(level => {
+        if (latest.levels[level]) wanted.push(...latest.levels[level].files);
+    });
+    await cacheFiles(cache, wanted);
+
+    await cache.put(absolute(MANIFEST_URL), new Response(JSON.stringify(latest)));
+    useManifest(latest);
+
+    const keep = new Set([...revisions].map(([href, revision]) => `${href}?__rev=${revision}`));
+    for (const request of await cache.keys()) {
+        if (request.url.includes('?__rev=') && !keep.has(request.url)) {
+            await cache.delete(request);
+        }
+    }
+}
+
+async function prefetchLevel(level, client) {
+    const data = await currentManifest();
+    const entry = data && data.levels[level];
+    if (!entry) return;
+
+    const cache = await caches.open(CACHE_NAME);
+    let reported = 0;
+    await cacheFiles(cache, entry.files, (done, total) => {
+        // Report roughly every 5% so a large level does not flood the page
+        if (done === total || done - reported >= total / 20) {
+            reported = done;
+            client.postMessage({ type: 'prefetch-progress', level, done, total });
+        }
+    });
+
+    const saved = await savedLevels(cache);
+    if (!saved.includes(level)) saved.push(level);
+    await cache.put(absolute(SAVED_LEVELS_KEY), new Response(JSON.stringify(saved)));
+    client.postMessage({ type: 'prefetch-done', level });
+}
+
+async function status(client) {
+    const data = await currentManifest();
+    const cache = await caches.open(CACHE_NAME);
+    const saved = await savedLevels(cache);
+    const levels = {};
+    if (data) {
+        Object.entries(data.levels).forEach(([level, entry]) => {
+            levels[level] = { size: entry.size, saved: saved.includes(level) };
+        });
+    }
+    client.postMessage({ type: 'status', levels });
+}
+
+// A saved level caches only its bundle; its MP3s are cut out of it on request
+async function bundledResponse(cache, href) {
+    const slice = slices.get(href);
+    const revision = slice && revisions.get(slice.bundle);
+    const bundle = revision && await cache.match(cacheKey(slice.bundle, revision));
+    if (!bundle) return null;
+
+    const body = (await bundle.blob()).slice(slice.offset, slice.offset + slice.size, 'audio/mpeg');
+    return new Response(body, {
+        headers: { 'Content-Type': 'audio/mpeg', 'Content-Length': String(slice.size) },
+    });
+}
+
+// <audio> may ask for byte ranges; answer them from the cached full file
+async function rangeResponse(request, response) {
+    const match = /bytes=(\d*)-(\d*)/.exec(request.headers.get('range') || '');
+    if (!match) return response;
+
+    const body = await response.blob();
+    const start = match[1] ? Number(match[1]) : Math.max(0, body.size - Number(match[2]));
+    const end = match[1] && match[2] ? Math.min(Number(match[2]), body.size - 1) : body.size - 1;
+    return new Response(body.slice(start, end + 1), {
+        status: 206,
+        headers: {
+            'Content-Type': response.headers.get('Content-Type') || 'audio/mpeg',
+            'Content-Range': `bytes ${start}-${end}/${body.size}`,
+            'Content-Length': String(end - start + 1),
+        },
+    });
+}
+
+async function respond(request) {
+    await currentManifest();
+    let href = request.url.split('#')[0].split('?')[0];
+    if (request.mode === 'navigate' && href === self.registration.scope) {
+        href = absolute('index.html');
+    }
+
+    const revision = revisions.get(href);
+    if (!revision) return fetch(request);
+
+    const cache = await caches.open(CACHE_NAME);
+    const key = cacheKey(href, revision);
+    let response = (await cache.match(key)) || (await bundledResponse(cache, href));
+    if (!response) {
+        // Fetch the whole file even for a range request; partial responses cannot be cached
+        response = await fetch(href);
+        if (!response.ok) return response;
+        await cache.put(key, response.clone());
+    }
+    return request.headers.has('range') ? rangeResponse(request, response) : response;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(update().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET' || !event.request.url.startsWith(self.registration.scope)) {
+        return;
+    }
+    event.respondWith(respond(event.request).catch(() => fetch(event.request)));
+});
+
+self.addEventListener('message', event => {
+    const { type, level } = event.data || {};
+    if (type === 'update') {
+        event.waitUntil(update().catch(error => {
+            // Offline or mid-deploy: keep serving the cached revision
+            console.warn('Precache update failed:', error);
+        }).then(() => status(event.source)));
+    } else if (type === 'prefetch') {
+        event.waitUntil(prefetchLevel(level, event.source).catch(error => {
+            console.error(`Prefetch of ${level} failed:`, error);
+            event.source.postMessage({ type: 'prefetch-failed', level });
+        }));
+    } else if (type === 'status') {
+        event.waitUntil(status(event.source));
+    }
+});
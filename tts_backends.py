@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# ABOUTME: Pluggable TTS backends: OpenAI speech API, local espeak-ng, and a deterministic silent engine
+# ABOUTME: Local backends render in a process pool shared by every level, with no network or API key
+
+import os
+import shutil
+import threading
+import time
+
+from metrics import console, record_phase
+from tts_engine import classify_error, partial_path, synthesize_word
+
+DEFAULT_BACKEND = 'openai'
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, mono, 417 bytes, ~26 ms)
+SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC4]) + bytes(413)
+
+# Dollars per million input characters, for cost estimates. gpt-4o-mini-tts is
+# billed by tokens (about $0.015 per minute of audio), which comes to roughly
+# this much for single words.
+TTS_PRICES = {
+    "tts-1": 15.0,
+    "tts-1-hd": 30.0,
+    "gpt-4o-mini-tts": 30.0,
+}
+
+# Models that take an "instructions" input, used for pronunciation hints
+INSTRUCTION_MODELS = ('gpt-4o-mini-tts',)
+
+
+class TTSBackend:
+    """
+    A speech engine that turns one word into one audio file.
+
+    `params` identifies everything that affects the audio; it is hashed into
+    each word's cache key and must include "response_format". Backends are
+    shared by all level workers and must be thread-safe.
+    """
+
+    name = None
+    supports_batch = False
+    # Worker threads per level; None means the --concurrency setting
+    workers = None
+    # Dollars per million characters; None when unknown
+    price_per_million_chars = 0.0
+
+    @property
+    def params(self):
+        raise NotImplementedError
+
+    def variant_params(self, settings):
+        """
+        Parameters for a voice variant (voice, speed, instructions overrides).
+
+        Engines that cannot honour the settings return their own params, so
+        the variant shares the default audio through the cache.
+        """
+        return self.params
+
+    def hinted_params(self, params, instructions):
+        """
+        `params` with a pronunciation hint added (see pronunciations).
+
+        Engines without an instruction input ignore the hint.
+        """
+        return params
+
+    def synthesize(self, word, output_path, limiter, label, span=None, params=None):
+        """
+        Write `word` to `output_path`. Returns None on success, otherwise the error.
+
+        `span`, when given, receives attempts, error classes and phase timings
+        (see metrics.SPAN_PHASES). `params` selects a variant from
+        variant_params() instead of the default.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class OpenAIBackend(TTSBackend):
+    """The OpenAI speech endpoint, rate limited by the shared TokenBucket."""
+
+    name = 'openai'
+    supports_batch = True
+
+    def __init__(self, params, client=None, connect=None):
+        # No "backend" entry: keys stay identical to those of earlier builds
+        self._params = dict(params)
+        self._client = client
+        self._connect_error = None
+        self._lock = threading.Lock()
+        self.connect = connect
+
+    @property
+    def client(self):
+        """
+        The OpenAI client, created by `connect()` when the first request
+        needs it, so builds served from the cache never ask for an API key.
+        """
+        with self._lock:
+            if self._client is None:
+                # A failed connect (no API key) fails every later request the same way
+                if self._connect_error is not None:
+                    raise self._connect_error
+                try:
+                    self._client = self.connect()
+                except BaseException as e:
+                    self._connect_error = e
+                    raise
+            return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    @property
+    def params(self):
+        return self._params
+
+    @property
+    def price_per_million_chars(self):
+        return TTS_PRICES.get(self._params.get('model'))
+
+    def variant_params(self, settings):
+        return dict(self._params, **settings)
+
+    def hinted_params(self, params, instructions):
+        if not instructions or params.get('model') not in INSTRUCTION_MODELS:
+            return params
+        # A variant's accent instructions still apply
+        combined = ' '.join(filter(None, [params.get('instructions'), instructions]))
+        return dict(params, instructions=combined)
+
+    def synthesize(self, word, output_path, limiter, label, span=None, params=None):
+        return synthesize_word(self.client, word, output_path, limiter, label,
+                               params=params or self._params, span=span)
+
+
+def _render_silent(word, output_path, options):
+    """Silence whose length grows with the word, so duration checks behave like speech."""
+    frames = options['base_frames'] + options['frames_per_char'] * len(word)
+    with open(output_path, 'wb') as f:
+        f.write(SILENT_MP3_FRAME * frames)
+
+
+def _render_espeak(word, output_path, options):
+    """Speak `word` with espeak-ng and encode the WAV to MP3 with ffmpeg."""
+    import subprocess
+
+    wav = subprocess.run(
+        [options['espeak'], '-v', options['voice'], '-s', str(options['speed']), '--stdout', word],
+        check=True, capture_output=True
+    ).stdout
+    subprocess.run(
+        [options['ffmpeg'], '-hide_banner', '-loglevel', 'error', '-y', '-i', 'pipe:0',
+         '-ac', '1', '-codec:a', 'libmp3lame', '-b:a', options['bitrate'], '-f', 'mp3',
+         output_path],
+        input=wav, check=True, capture_output=True
+    )
+
+
+class LocalBackend(TTSBackend):
+    """
+    Offline engine whose `render(word, path, options)` runs in a process pool.
+
+    The pool is created on first use and shared by every level, so a full
+    rebuild keeps all cores busy; level threads only wait on it.
+    """
+
+    render = None
+    options = {}
+
+    def __init__(self, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.workers = self.processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def params(self):
+        return dict(self.options, backend=self.name, response_format='mp3')
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._pool
+
+    def synthesize(self, word, output_path, limiter, label, span=None, params=None):
+        console.detail(f"{label} 🔊 Generating '{word}' ({self.name})")
+        if span is not None:
+            span['attempts'] = 1
+        part_path = partial_path(output_path)
+        start = time.perf_counter()
+        try:
+            self._executor().submit(type(self).render, word, str(part_path), self.render_options).result()
+            os.replace(part_path, output_path)
+            record_phase(span, 'request', time.perf_counter() - start)
+            return None
+        except Exception as e:
+            if span is not None:
+                span.setdefault('errors', []).append(classify_error(e))
+            if part_path.exists():
+                part_path.unlink()
+            return e
+
+    @property
+    def render_options(self):
+        return self.options
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+class SilentBackend(LocalBackend):
+    """Deterministic silent MP3s: exercises the whole pipeline in tests and CI."""
+
+    name = 'silent'
+    render = staticmethod(_render_silent)
+    options = {"base_frames": 12, "frames_per_char": 2}
+
+
+class EspeakBackend(LocalBackend):
+    """espeak-ng speech synthesizer, encoded to MP3 with ffmpeg."""
+
+    name = 'espeak'
+    render = staticmethod(_render_espeak)
+
+    def __init__(self, voice='en-us', speed=150, bitrate='64k', processes=None):
+        super().__init__(processes)
+        self.espeak = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.ffmpeg = shutil.which('ffmpeg')
+        if self.espeak is None or self.ffmpeg is None:
+            raise RuntimeError("the espeak backend needs espeak-ng and ffmpeg on PATH")
+        self.options = {"voice": voice, "speed": speed, "bitrate": bitrate}
+
+    @property
+    def render_options(self):
+        # Executable paths are machine-specific, so they stay out of the cache key
+        return dict(self.options, espeak=self.espeak, ffmpeg=self.ffmpeg)
+
+
+BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    EspeakBackend.name: EspeakBackend,
+    SilentBackend.name: SilentBackend,
+}
+
+
+def create_backend(name, openai_params=None):
+    """
+    Instantiate a backend by name.
+
+    Args:
+        name: One of BACKENDS
+        openai_params: TTS request parameters for the OpenAI backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"unknown TTS backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if name == OpenAIBackend.name:
+        return OpenAIBackend(openai_params)
+    return BACKENDS[name]()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# ABOUTME: Concurrent TTS job runner with a bounded worker pool and adaptive rate limiting
+# ABOUTME: Replaces the fixed sleep between requests with a token bucket that honours 429 Retry-After
+
+import os
+import threading
+import time
+
+from metrics import console, record_phase
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0          # requests per second across all workers
+DEFAULT_MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every synthesis worker.
+
+    The refill rate adapts AIMD-style: a 429 halves it and pauses the bucket
+    until the server's Retry-After has elapsed, and each success creeps it
+    back up towards the configured rate.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=None, min_rate=0.2):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Block until a request slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def backoff(self, delay):
+        """React to a 429: pause everyone for `delay` seconds and halve the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = 0.0
+            self._updated = max(now, self._paused_until)
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def record_success(self):
+        """Additively recover the rate after a successful request."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+def _status_code(exc):
+    status = getattr(exc, 'status_code', None)
+    if status is None:
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status
+
+
+def retry_after_seconds(exc):
+    """
+    Extract the server-requested delay from a rate-limit error, if any.
+
+    Understands OpenAI's `retry-after-ms` as well as the standard
+    `Retry-After` header in both delta-seconds and HTTP-date form.
+    """
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(exc):
+    return _status_code(exc) == 429
+
+
+def classify_error(exc):
+    """Error class for metrics, e.g. "RateLimitError (429)" or "APITimeoutError"."""
+    status = _status_code(exc)
+    return f"{type(exc).__name__} ({status})" if status else type(exc).__name__
+
+
+def partial_path(output_path):
+    """Where `output_path` is written before being renamed into place."""
+    return output_path.with_name(output_path.name + '.part')
+
+
+def synthesize_word(client, word, output_path, limiter, label, params,
+                    max_retries=DEFAULT_MAX_RETRIES, span=None):
+    """
+    Synthesize a single word to `output_path`, retrying transient failures.
+
+    The response is streamed to a `.part` file and renamed over
+    `output_path` only once complete.
+
+    Args:
+        client: OpenAI client instance (thread-safe, shared by all workers)
+        word: Text to synthesize
+        output_path: Destination MP3 path
+        limiter: Shared TokenBucket
+        label: Log prefix such as "[1B] [  3/145]"
+        params: TTS request parameters (model, voice, response_format, ...)
+        max_retries: Attempts before giving up
+        span: Dict that receives attempts, error classes and per-phase seconds
+
+    Returns:
+        None on success, otherwise the last exception.
+    """
+    retry_delay = 2
+    last_error = None
+    # Streamed to a side file so a killed run never leaves a truncated MP3 in place
+    part_path = partial_path(output_path)
+
+    for attempt in range(max_retries):
+        if attempt == 0:
+            console.detail(f"{label} 🔊 Generating '{word}'")
+        else:
+            console.detail(f"{label} 🔄 Retrying '{word}' (attempt {attempt + 1}/{max_retries})")
+        if span is not None:
+            span['attempts'] = attempt + 1
+
+        waited = time.perf_counter()
+        limiter.acquire()
+        sent = time.perf_counter()
+        record_phase(span, 'rate_wait', sent - waited)
+        try:
+            with client.audio.speech.with_streaming_response.create(
+                input=word,
+                **params
+            ) as response:
+                # Entered once the response headers have arrived
+                received = time.perf_counter()
+                record_phase(span, 'request', received - sent)
+                response.stream_to_file(part_path)
+            os.replace(part_path, output_path)
+            record_phase(span, 'stream', time.perf_counter() - received)
+            limiter.record_success()
+            return None
+
+        except Exception as e:
+            last_error = e
+            if span is not None:
+                span.setdefault('errors', []).append(classify_error(e))
+            if part_path.exists():
+                part_path.unlink()
+            if attempt == max_retries - 1:
+                break
+            if is_rate_limited(e):
+                delay = retry_after_seconds(e) or retry_delay
+                console.detail(f"{label} ⏳ Rate limited. Backing off {delay:.1f}s...")
+                # The bucket pauses every worker, so no extra sleep here
+                limiter.backoff(delay)
+            else:
+                console.detail(f"{label} ⚠️  Error: {e}. Retrying in {retry_delay}s...")
+                record_phase(span, 'backoff', retry_delay)
+                time.sleep(retry_delay)
+            retry_delay *= 2
+
+    return last_error
+
+
+def run_jobs(jobs, worker, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Run `worker(job)` over `jobs` with at most `concurrency` jobs in flight.
+
+    `jobs` may be any iterable (including a generator); it is consumed
+    lazily so queued work never grows past the pool size. Yields
+    `(job, result)` pairs in completion order.
+    """
+    # Imported on first use so offline commands (plans, index rebuilds) start fast
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    jobs = iter(jobs)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = {}
+
+        def fill():
+            while len(pending) < concurrency:
+                job = next(jobs, None)
+                if job is None:
+                    return
+                pending[pool.submit(worker, job)] = job
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                yield job, future.result()
+            fill()
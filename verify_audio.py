@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# ABOUTME: Audio integrity scanner: walks MP3 frame headers to validate files and measure duration
+# ABOUTME: Also reports orphaned audio files and words without audio, as text or JSON
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from filenames import sanitize_filename
+from levels import load_levels
+from mp3_frames import scan_mp3
+from pronunciations import load_pronunciations, synthesis_input
+from word_index import read_words_json
+
+# A spoken word should last at least this long, plus a little per letter at most
+MIN_SECONDS = 0.2
+MAX_BASE_SECONDS = 2.0
+MAX_SECONDS_PER_CHAR = 0.25
+
+
+def duration_bounds(text):
+    """Plausible duration range in seconds for the text actually spoken (word, respelling or carrier sentence)."""
+    return MIN_SECONDS, MAX_BASE_SECONDS + MAX_SECONDS_PER_CHAR * len(text)
+
+
+def check_file(path, word, spoken=None):
+    """
+    Validate one MP3. Runs in a pool worker.
+
+    The file is memory-mapped so only the pages holding frame headers
+    are actually read. `spoken` is the text sent to the TTS engine when a
+    pronunciation override replaced the word.
+    """
+    result = {"file": str(path), "word": word, "size": 0, "duration": None, "error": None}
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            result["size"] = size
+            if size == 0:
+                result["error"] = "empty file"
+                return result
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                scan = scan_mp3(data)
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+
+    result["duration"] = round(scan["duration"], 3)
+    result["error"] = scan["error"]
+    if result["error"] is None and word is not None:
+        low, high = duration_bounds(spoken or word)
+        if not low <= scan["duration"] <= high:
+            result["error"] = f"duration {scan['duration']:.2f}s outside {low:.1f}-{high:.1f}s"
+    return result
+
+
+def _check_batch(batch):
+    return [check_file(path, word, spoken) for path, word, spoken in batch]
+
+
+def verify_levels(configs, workers=None, processes=False, pronunciations=None):
+    """
+    Check every level's audio directory, and those of its variants,
+    against its words JSON.
+
+    Args:
+        configs: Bee configs from levels.load_levels
+        workers: Pool size (defaults to a few per core for threads, one per core for processes)
+        processes: Parse in a process pool instead of a thread pool
+        pronunciations: PronunciationIndex whose overrides set each word's expected duration
+
+    Returns:
+        Report dict with per-level invalid, orphaned and missing files plus totals.
+    """
+    start = time.perf_counter()
+    levels = {}
+    tasks = []
+
+    for config in configs:
+        expected = {}
+        for word in read_words_json(config['json_file']):
+            expected.setdefault(sanitize_filename(word), word)
+
+        # Each voice variant is reported as its own level, e.g. "1B/slow"
+        outputs = [(config['level'], config['audio_dir'])]
+        outputs.extend((variant['key'], variant['audio_dir'])
+                       for variant in config.get('variants', []))
+        for level, audio_dir in outputs:
+            present = set()
+            orphaned = []
+            if audio_dir.is_dir():
+                with os.scandir(audio_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.mp3'):
+                            continue
+                        filename = entry.name[:-4]
+                        if filename in expected:
+                            present.add(filename)
+                            word = expected[filename]
+                            spoken = None
+                            if pronunciations is not None:
+                                spoken, _ = synthesis_input(word, pronunciations.lookup(word))
+                            tasks.append((level, Path(entry.path), word, spoken))
+                        else:
+                            orphaned.append(entry.name)
+
+            levels[level] = {
+                "words": len(expected),
+                "files": len(present) + len(orphaned),
+                "invalid": [],
+                "orphaned": sorted(orphaned),
+                "missing": sorted(f"{filename}.mp3" for filename in expected.keys() - present),
+            }
+
+    # Batches keep per-task overhead low when there are hundreds of thousands of files
+    batch_size = 256
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+    if processes:
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4))
+
+    durations = []
+    with pool:
+        for batch, results in zip(batches,
+                                  pool.map(_check_batch, [[task[1:] for task in b] for b in batches])):
+            for (level, *_), result in zip(batch, results):
+                if result["error"]:
+                    levels[level]["invalid"].append(result)
+                elif result["duration"] is not None:
+                    durations.append(result["duration"])
+
+    totals = {
+        key: sum(len(level[key]) for level in levels.values())
+        for key in ("invalid", "orphaned", "missing")
+    }
+    totals["files"] = sum(level["files"] for level in levels.values())
+    totals["scanned"] = len(tasks)
+    totals["audio_seconds"] = round(sum(durations), 1)
+    return {
+        "ok": not (totals["invalid"] or totals["orphaned"] or totals["missing"]),
+        "seconds": round(time.perf_counter() - start, 3),
+        "totals": totals,
+        "levels": levels,
+    }
+
+
+def print_report(report):
+    """Print the scan in the style of verify_words.py."""
+    print(f"\n{'='*70}")
+    print("AUDIO VERIFICATION")
+    print("="*70)
+
+    for level, result in report["levels"].items():
+        print(f"\n{level}: {result['files']} files for {result['words']} words")
+        for item in result["invalid"]:
+            print(f"  ❌ {Path(item['file']).name}: {item['error']}")
+        for name in result["orphaned"]:
+            print(f"  🗑️  orphaned {name}")
+        for name in result["missing"]:
+            print(f"  ⚠️  missing {name}")
+
+    totals = report["totals"]
+    print(f"\n{'='*70}")
+    print(f"Scanned {totals['scanned']} files ({totals['audio_seconds']:.0f}s of audio) "
+          f"in {report['seconds']:.2f}s")
+    print(f"  ❌ Invalid:  {totals['invalid']}")
+    print(f"  🗑️  Orphaned: {totals['orphaned']}")
+    print(f"  ⚠️  Missing:  {totals['missing']}")
+    print("="*70)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description="Validate generated MP3s against the word lists")
+    parser.add_argument('levels', nargs='*', help="level ids (default: every level in levels.json)")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write the report as JSON to PATH ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--processes', action='store_true',
+                        help="parse in a process pool instead of threads")
+    args = parser.parse_args(argv)
+
+    project_root = Path(__file__).parent
+    configs = load_levels(project_root)
+    if args.levels:
+        configs = [config for config in configs if config['level'] in args.levels]
+
+    report = verify_levels(configs, workers=args.workers, processes=args.processes,
+                           pronunciations=load_pronunciations(project_root))
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == '__main__':
+    main()
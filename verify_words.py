@@ -1,6 +1,15 @@
 #!/usr/bin/env python3
 # ABOUTME: Verification script to find missing words from original images
-# ABOUTME: Compares image word lists with current text files
+# ABOUTME: Compares image word lists with current text files and reports duplicates/near-duplicates
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from word_checks import find_duplicates, print_report
+
+PROJECT_ROOT = Path(__file__).parent
 
 # Words from images (manually extracted)
 one_bee_words = [
@@ -98,72 +107,103 @@ three_bee_words = [
     "pizzeria", "bayonet"
 ]
 
-# Read current files
+# Image lists per level in levels.json
+IMAGE_WORDS = {
+    '1B': one_bee_words,
+    '2B': two_bee_words,
+    '3B': three_bee_words,
+}
+
+
 def read_words_from_file(filename):
     with open(filename, 'r', encoding='utf-8') as f:
         return [line.strip() for line in f if line.strip()]
 
-one_bee_current = read_words_from_file('/Users/yh/Projects/personal/spellingbee/schoolBee_1.txt')
-two_bee_current = read_words_from_file('/Users/yh/Projects/personal/spellingbee/schoolBee_2.txt')
-three_bee_current = read_words_from_file('/Users/yh/Projects/personal/spellingbee/schoolBee_3.txt')
 
-# Remove duplicates and convert to lowercase for comparison
 def normalize_words(words):
     # Keep original but create lowercase set for comparison
     return {w.lower(): w for w in words}
 
-one_bee_image_norm = normalize_words(one_bee_words)
-two_bee_image_norm = normalize_words(two_bee_words)
-three_bee_image_norm = normalize_words(three_bee_words)
-
-one_bee_current_norm = normalize_words(one_bee_current)
-two_bee_current_norm = normalize_words(two_bee_current)
-three_bee_current_norm = normalize_words(three_bee_current)
-
-# Find missing words
-one_bee_missing = set(one_bee_image_norm.keys()) - set(one_bee_current_norm.keys())
-two_bee_missing = set(two_bee_image_norm.keys()) - set(two_bee_current_norm.keys())
-three_bee_missing = set(three_bee_image_norm.keys()) - set(three_bee_current_norm.keys())
-
-print("="*70)
-print("WORD COUNT VERIFICATION")
-print("="*70)
-print(f"\n1B Words:")
-print(f"  From images: {len(one_bee_image_norm)}")
-print(f"  In file: {len(one_bee_current_norm)}")
-print(f"  Missing: {len(one_bee_missing)}")
-
-print(f"\n2B Words:")
-print(f"  From images: {len(two_bee_image_norm)}")
-print(f"  In file: {len(two_bee_current_norm)}")
-print(f"  Missing: {len(two_bee_missing)}")
-
-print(f"\n3B Words:")
-print(f"  From images: {len(three_bee_image_norm)}")
-print(f"  In file: {len(three_bee_current_norm)}")
-print(f"  Missing: {len(three_bee_missing)}")
-
-print(f"\nTotal from images: {len(one_bee_image_norm) + len(two_bee_image_norm) + len(three_bee_image_norm)}")
-print(f"Total in files: {len(one_bee_current_norm) + len(two_bee_current_norm) + len(three_bee_current_norm)}")
-print(f"Total missing: {len(one_bee_missing) + len(two_bee_missing) + len(three_bee_missing)}")
-
-if one_bee_missing:
-    print(f"\n{'='*70}")
-    print("MISSING FROM 1B:")
-    print("="*70)
-    for word in sorted(one_bee_missing):
-        print(f"  - {one_bee_image_norm[word]}")
 
-if two_bee_missing:
-    print(f"\n{'='*70}")
-    print("MISSING FROM 2B:")
+def verify_levels(configs, image_words=IMAGE_WORDS):
+    """
+    Compare each level's word file with the words extracted from its images.
+
+    Args:
+        configs: Bee configs from levels.load_levels; levels without image lists are skipped
+        image_words: Dict of level -> words from the images
+
+    Returns:
+        Report dict: per level the image and file counts and the image words
+        missing from the file, plus duplicate checks of both sets of lists.
+    """
+    levels = {}
+    current_words = {}
+    for config in configs:
+        level = config['level']
+        if level not in image_words:
+            continue
+        current_words[level] = read_words_from_file(config['source_file'])
+        image_norm = normalize_words(image_words[level])
+        current_norm = normalize_words(current_words[level])
+        levels[level] = {
+            "images": len(image_norm),
+            "file": len(current_norm),
+            "missing": [image_norm[word] for word in sorted(image_norm.keys() - current_norm.keys())],
+        }
+
+    # Duplicate, accent-insensitive and near-duplicate checks within and across levels
+    return {
+        "levels": levels,
+        "image_duplicates": find_duplicates(
+            [(level, w) for level in levels for w in image_words[level]]),
+        "file_duplicates": find_duplicates(
+            [(level, w) for level in levels for w in current_words[level]]),
+    }
+
+
+def print_verification(report):
+    levels = report['levels']
     print("="*70)
-    for word in sorted(two_bee_missing):
-        print(f"  - {two_bee_image_norm[word]}")
-
-if three_bee_missing:
-    print(f"\n{'='*70}")
-    print("MISSING FROM 3B:")
+    print("WORD COUNT VERIFICATION")
     print("="*70)
-    for word in sorted(three_bee_missing):
-        print(f"  - {three_bee_image_norm[word]}")
+    for level, result in levels.items():
+        print(f"\n{level} Words:")
+        print(f"  From images: {result['images']}")
+        print(f"  In file: {result['file']}")
+        print(f"  Missing: {len(result['missing'])}")
+
+    print(f"\nTotal from images: {sum(result['images'] for result in levels.values())}")
+    print(f"Total in files: {sum(result['file'] for result in levels.values())}")
+    print(f"Total missing: {sum(len(result['missing']) for result in levels.values())}")
+
+    for level, result in levels.items():
+        if result['missing']:
+            print(f"\n{'='*70}")
+            print(f"MISSING FROM {level}:")
+            print("="*70)
+            for word in result['missing']:
+                print(f"  - {word}")
+
+    print_report("DUPLICATES IN IMAGE LISTS", report['image_duplicates'])
+    print_report("DUPLICATES IN WORD FILES", report['file_duplicates'])
+
+
+def main(argv=None, prog=None):
+    from levels import load_levels
+
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Compare the word files with the lists from the images")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = verify_levels(load_levels(PROJECT_ROOT))
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_verification(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# ABOUTME: Watches the level word files for edits: filesystem events through watchdog, else mtime polling
+# ABOUTME: Debounces bursts of saves and diffs each file line by line into added and removed words
+
+import difflib
+import os
+import queue
+import time
+from pathlib import Path
+
+POLL_INTERVAL = 0.5     # seconds between stat() sweeps without watchdog
+DEBOUNCE = 0.75         # quiet seconds after the last change before a rebuild
+
+
+def _signature(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SourceWatcher:
+    """
+    Reports which of `paths` changed.
+
+    Uses watchdog (pip install watchdog), which wraps inotify, FSEvents or
+    ReadDirectoryChangesW, when it is installed, and otherwise polls each
+    file's mtime and size every `interval` seconds. Editors that save by
+    writing a new file and renaming it over the old one are handled either
+    way, since the watched directories are observed rather than the files.
+    """
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = {Path(path).resolve() for path in paths}
+        self.interval = interval
+        self._events = queue.Queue()
+        self._observer = None
+        self._signatures = {path: _signature(path) for path in self.paths}
+
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            self.mode = 'polling'
+            return
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for attr in ('src_path', 'dest_path'):
+                    path = getattr(event, attr, None)
+                    if path and Path(os.fsdecode(path)).resolve() in watcher.paths:
+                        watcher._events.put(Path(os.fsdecode(path)).resolve())
+
+        self._observer = Observer()
+        for directory in {path.parent for path in self.paths}:
+            self._observer.schedule(Handler(), str(directory), recursive=False)
+        self._observer.start()
+        self.mode = 'watchdog'
+
+    def _changed_by_stat(self):
+        changed = set()
+        for path in self.paths:
+            signature = _signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def poll(self, timeout):
+        """Block up to `timeout` seconds; return the set of paths that changed."""
+        if self._observer is None:
+            deadline = time.monotonic() + timeout
+            while True:
+                changed = self._changed_by_stat()
+                remaining = deadline - time.monotonic()
+                if changed or remaining <= 0:
+                    return changed
+                time.sleep(min(self.interval, remaining))
+
+        try:
+            self._events.get(timeout=timeout)
+            while True:
+                self._events.get_nowait()
+        except queue.Empty:
+            pass
+        # Events also fire when a file is merely opened or read (the rebuild
+        # itself reads it), so only files whose mtime or size moved count
+        return self._changed_by_stat()
+
+    def changes(self, debounce=DEBOUNCE):
+        """
+        Yield sets of changed paths, forever.
+
+        A set is yielded once no further change has arrived for `debounce`
+        seconds, so an editor's burst of writes (or several files saved
+        together) becomes one rebuild.
+        """
+        while True:
+            pending = self.poll(timeout=3600)
+            while pending:
+                more = self.poll(timeout=debounce)
+                if not more:
+                    break
+                pending |= more
+            if pending:
+                yield pending
+
+    def close(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+
+def diff_words(old_words, new_words):
+    """
+    Line diff of a word list.
+
+    Returns:
+        (added, removed): words that are new in `new_words`, and words that
+        are gone from it, each in list order. Changed lines count as one
+        removal and one addition; a word that merely moved is neither.
+    """
+    old_set = set(old_words)
+    new_set = set(new_words)
+    added = []
+    removed = []
+    matcher = difflib.SequenceMatcher(a=old_words, b=new_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(word for word in old_words[i1:i2] if word not in new_set)
+        if tag in ('replace', 'insert'):
+            added.extend(word for word in new_words[j1:j2] if word not in old_set)
+    return added, removed
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# ABOUTME: Finds exact, accent-insensitive and near-duplicate words within and across levels
+# ABOUTME: Uses a SymSpell-style deletion index so large master lists avoid pairwise comparison
+
+import argparse
+import json
+import sys
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from filenames import sanitize_filename
+
+DEFAULT_MAX_DISTANCE = 1
+DEFAULT_MIN_LENGTH = 4      # three-letter words differ by one letter all the time (tag/tab)
+
+
+def exact_key(word):
+    return unicodedata.normalize('NFC', ' '.join(word.split())).casefold()
+
+
+def accent_key(word):
+    """Accent-, case- and punctuation-insensitive form (the audio filename)."""
+    return sanitize_filename(word)
+
+
+def deletes(word, max_distance):
+    """All strings reachable from `word` by deleting up to `max_distance` characters."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (adjacent transpositions count as one).
+
+    Returns `limit + 1` as soon as the distance is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def find_duplicates(entries, max_distance=DEFAULT_MAX_DISTANCE, min_length=DEFAULT_MIN_LENGTH):
+    """
+    Classify duplicate words.
+
+    Args:
+        entries: Iterable of (level, word) pairs
+        max_distance: Largest edit distance reported as a near-duplicate
+        min_length: Words shorter than this are not checked for near-duplicates
+
+    Returns:
+        Dict with three lists:
+            exact:  {"word", "occurrences": [[level, word], ...]} seen more than once
+            accent: {"key", "occurrences": [...]} that differ only by accents/case/punctuation
+            near:   {"a": [level, word], "b": [level, word], "distance"} pairs
+    """
+    by_exact = defaultdict(list)
+    by_accent = defaultdict(list)
+    for level, word in entries:
+        by_exact[exact_key(word)].append([level, word])
+        by_accent[accent_key(word)].append([level, word])
+
+    exact = [
+        {"word": key, "occurrences": occurrences}
+        for key, occurrences in by_exact.items()
+        if len(occurrences) > 1
+    ]
+    accent = [
+        {"key": key, "occurrences": occurrences}
+        for key, occurrences in by_accent.items()
+        if len({exact_key(word) for _, word in occurrences}) > 1
+    ]
+
+    # Deletion index over distinct accent keys: two keys within distance d
+    # always share at least one string in their d-deletion neighbourhoods.
+    keys = [key for key in by_accent if len(key) >= min_length]
+    index = defaultdict(list)
+    for idx, key in enumerate(keys):
+        for variant in deletes(key, max_distance):
+            index[variant].append(idx)
+
+    pairs = set()
+    for bucket in index.values():
+        if len(bucket) < 2:
+            continue
+        for i, left in enumerate(bucket):
+            for right in bucket[i + 1:]:
+                pairs.add((left, right) if left < right else (right, left))
+
+    near = []
+    for left, right in sorted(pairs):
+        distance = edit_distance(keys[left], keys[right], max_distance)
+        if distance <= max_distance:
+            near.append({
+                "a": by_accent[keys[left]][0],
+                "b": by_accent[keys[right]][0],
+                "distance": distance,
+            })
+
+    return {"exact": exact, "accent": accent, "near": near}
+
+
+def print_report(title, report):
+    """Print a duplicate report in the style of verify_words.py."""
+    print(f"\n{'='*70}")
+    print(title)
+    print("="*70)
+
+    print(f"\nExact duplicates: {len(report['exact'])}")
+    for item in report['exact']:
+        places = ', '.join(level for level, _ in item['occurrences'])
+        print(f"  - {item['occurrences'][0][1]} ({places})")
+
+    print(f"\nAccent/case-insensitive duplicates: {len(report['accent'])}")
+    for item in report['accent']:
+        variants = ', '.join(f"{word} ({level})" for level, word in item['occurrences'])
+        print(f"  - {variants}")
+
+    print(f"\nNear-duplicates: {len(report['near'])}")
+    for item in report['near']:
+        print(f"  - {item['a'][1]} ({item['a'][0]}) ~ {item['b'][1]} ({item['b'][0]}) "
+              f"[distance {item['distance']}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate words")
+    parser.add_argument('files', nargs='+', type=Path,
+                        help="word files, one word per line; each file is treated as a level")
+    parser.add_argument('-d', '--max-distance', type=int, default=DEFAULT_MAX_DISTANCE)
+    parser.add_argument('--min-length', type=int, default=DEFAULT_MIN_LENGTH)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    entries = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries.extend((path.stem, line.strip()) for line in f if line.strip())
+
+    start = time.perf_counter()
+    report = find_duplicates(entries, args.max_distance, args.min_length)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(f"DUPLICATE CHECK ({len(entries)} words, {elapsed:.2f}s)", report)
+
+
+if __name__ == '__main__':
+    main()
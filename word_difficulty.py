@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# ABOUTME: Scores word difficulty at build time from length, syllables, letter-pattern rarity and accents
+# ABOUTME: Also pre-shuffles quiz decks per level in one vectorized NumPy pass, so the browser does no work
+
+import argparse
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+TIERS = 5
+DECKS_PER_LEVEL = 5
+
+# Weights of the standardized features; accents and phrases add a fixed bump
+WEIGHTS = {"letters": 0.35, "syllables": 0.25, "rarity": 0.40}
+ACCENT_BONUS = 0.75
+PHRASE_BONUS = 0.5
+
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+PHRASE_MARKS = re.compile(r"[\s\-'’]")
+
+
+def fold(word):
+    """Lowercase `word` and strip accents: "Crème brûlée" -> "creme brulee"."""
+    decomposed = unicodedata.normalize('NFD', word.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def estimate_syllables(word):
+    """Vowel groups per token, minus a silent final e; at least one per token."""
+    total = 0
+    for token in re.findall(r'[a-z]+', fold(word)):
+        count = len(VOWEL_GROUPS.findall(token))
+        if token.endswith('e') and not token.endswith(('le', 'ee')) and count > 1:
+            count -= 1
+        total += max(1, count)
+    return max(1, total)
+
+
+def trigrams(word):
+    """Letter trigrams of each token, padded with word boundaries."""
+    grams = []
+    for token in re.findall(r'[a-z]+', fold(word)):
+        padded = f"^{token}$"
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_features(words):
+    """
+    Per-word features as NumPy arrays, aligned with `words`.
+
+    Rarity is the mean surprisal (-log2 p) of the word's letter trigrams,
+    with trigram frequencies counted across every word passed in, so it
+    should be called with all levels at once.
+    """
+    vocabulary = {}
+    ids = []
+    offsets = []
+    for word in words:
+        offsets.append(len(ids))
+        ids.extend(vocabulary.setdefault(gram, len(vocabulary)) for gram in trigrams(word))
+    ids = np.asarray(ids, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(np.append(offsets, len(ids)))
+
+    counts = np.bincount(ids, minlength=len(vocabulary))
+    # Add-one smoothing keeps every surprisal finite
+    surprisal = -np.log2((counts + 1) / (counts.sum() + len(vocabulary)))
+    totals = np.zeros(len(words))
+    nonempty = lengths > 0
+    if ids.size:
+        totals[nonempty] = np.add.reduceat(surprisal[ids], offsets[nonempty])
+
+    return {
+        "letters": np.array([sum(c.isalpha() for c in word) for word in words], dtype=float),
+        "syllables": np.array([estimate_syllables(word) for word in words], dtype=float),
+        "rarity": np.divide(totals, lengths, out=np.zeros(len(words)), where=nonempty),
+        "accents": np.array([fold(word) != word.lower() for word in words]),
+        "phrase": np.array([bool(PHRASE_MARKS.search(word.strip())) for word in words]),
+    }
+
+
+def difficulty_scores(features):
+    """Weighted sum of z-scored features plus the accent and phrase bonuses."""
+    score = np.zeros(len(features['letters']))
+    for name, weight in WEIGHTS.items():
+        values = features[name]
+        spread = values.std()
+        if spread > 0:
+            score += weight * (values - values.mean()) / spread
+    score += ACCENT_BONUS * features['accents'] + PHRASE_BONUS * features['phrase']
+    return score
+
+
+def difficulty_tiers(scores, tiers=TIERS):
+    """Rank scores into `tiers` equal-sized buckets, 1 (easiest) to `tiers`."""
+    if not len(scores):
+        return np.zeros(0, dtype=np.int64)
+    ranks = np.argsort(np.argsort(scores, kind='stable'), kind='stable')
+    return 1 + ranks * tiers // len(scores)
+
+
+def shuffled_decks(tiers, count, seed):
+    """
+    `count` quiz orders of one level's words, as rows of 0-based indices.
+
+    Each deck runs from easy to hard tier by tier, shuffled within a tier.
+    The seed comes from the level's words, so decks only change with them.
+    """
+    rng = np.random.default_rng(seed)
+    keys = tiers[np.newaxis, :] + rng.random((count, len(tiers)))
+    return np.argsort(keys, axis=1)
+
+
+def level_seed(words):
+    return int.from_bytes(hashlib.sha256('\n'.join(words).encode('utf-8')).digest()[:8], 'big')
+
+
+def score_levels(level_words, decks=DECKS_PER_LEVEL):
+    """
+    Difficulty tiers and quiz decks for every level.
+
+    Args:
+        level_words: Dict of level -> list of words in display order
+        decks: Decks to shuffle per level
+
+    Returns:
+        Dict of level -> {"difficulty": tier per word (1-5), "decks": list of index lists}
+    """
+    levels = list(level_words)
+    words = [word for level in levels for word in level_words[level]]
+    tiers = difficulty_tiers(difficulty_scores(word_features(words)))
+
+    result = {}
+    start = 0
+    for level in levels:
+        count = len(level_words[level])
+        level_tiers = tiers[start:start + count]
+        start += count
+        result[level] = {
+            "difficulty": level_tiers.tolist(),
+            "decks": shuffled_decks(level_tiers, decks, level_seed(level_words[level])).tolist()
+                     if count else [],
+        }
+    return result
+
+
+def main():
+    """Print each level's tier spread and hardest words, optionally exporting many decks."""
+    from levels import load_levels
+    from word_index import read_words_json
+
+    parser = argparse.ArgumentParser(description="Score word difficulty and shuffle quiz decks")
+    parser.add_argument('--decks', type=int, default=DECKS_PER_LEVEL,
+                        help=f"decks per level (default: {DECKS_PER_LEVEL})")
+    parser.add_argument('--json', type=Path, metavar='PATH',
+                        help="write tiers and decks for every level to PATH")
+    args = parser.parse_args()
+
+    configs = load_levels(Path(__file__).parent)
+    level_words = {config['level']: read_words_json(config['json_file']) for config in configs}
+    scored = score_levels(level_words, decks=args.decks)
+
+    for level, words in level_words.items():
+        tiers = scored[level]['difficulty']
+        spread = ' '.join(f"{tier}:{tiers.count(tier)}" for tier in range(1, TIERS + 1))
+        hardest = [word for word, tier in zip(words, tiers) if tier == TIERS][:5]
+        print(f"{level}: {len(words)} words, tiers {spread}")
+        print(f"  hardest: {', '.join(hardest)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(scored, f, separators=(',', ':'))
+        print(f"Wrote {args.decks} decks per level to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# ABOUTME: Builds a small content-hashed level index plus one compact, hashed word file per level
+# ABOUTME: Points index.html at the index so the web app renders levels and fetches words on demand
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+INDEX_VERSION = 3
+LEVELS_DIR_NAME = 'levels'
+META_PATTERN = re.compile(r'(<meta name="word-index" content=")([^"]*)(">)')
+
+
+def read_words_json(json_file):
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return [w['word'] for w in json.load(f)['words']]
+
+
+def _minify(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def render_level(words, highlights=None, bundle=None, scored=None):
+    """
+    Serialize one level as minified JSON.
+
+    The words are a newline-joined string table; a word's id is its
+    1-based position, so no per-word objects or ids are shipped.
+
+    Args:
+        words: List of words in display order
+        highlights: Words to highlight as new
+        bundle: {"url", "ranges"} from audio_bundles.bundle_index
+        scored: {"difficulty", "decks"} from word_difficulty.score_levels
+    """
+    payload = {"v": INDEX_VERSION, "words": '\n'.join(words)}
+    if highlights:
+        payload["new"] = '\n'.join(highlights)
+    if bundle:
+        payload["bundle"] = bundle
+    if scored:
+        # One digit per word, easiest 1 to hardest 5
+        payload["difficulty"] = ''.join(str(tier) for tier in scored["difficulty"])
+        payload["decks"] = scored["decks"]
+    return _minify(payload)
+
+
+def render_index(entries):
+    """
+    Serialize the level index: registry order, titles, counts and the
+    hashed URL of each level's word file.
+    """
+    return _minify({"v": INDEX_VERSION, "levels": entries})
+
+
+def _write_hashed(content, directory, prefix):
+    """Write `directory/<prefix>.<hash>.json` and delete older versions."""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    path = directory / f"{prefix}.{digest}.json"
+
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    for stale in directory.glob(f"{prefix}.*.json"):
+        if stale != path:
+            stale.unlink()
+    return path
+
+
+def current_index(html_path):
+    """Return the index path referenced by index.html, or None."""
+    match = META_PATTERN.search(html_path.read_text(encoding='utf-8'))
+    return match.group(2) if match else None
+
+
+def index_is_current(html_path, configs):
+    """
+    True when index.html points at an existing index that lists the
+    registry's levels, with the same titles and variants, in the same order.
+    """
+    referenced = current_index(html_path)
+    if referenced is None or not (html_path.parent / referenced).exists():
+        return False
+    with open(html_path.parent / referenced, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('v') != INDEX_VERSION:
+        return False
+    listed = [(entry['id'], entry['title'], entry.get('variants', []))
+              for entry in index['levels']]
+    return listed == [(config['level'], config['title'], _variant_entries(config))
+                      for config in configs]
+
+
+def _variant_entries(config):
+    """The voice variants the app offers for a level, besides the default."""
+    return [{"id": variant['id'], "label": variant['label']}
+            for variant in config.get('variants', [])]
+
+
+def write_word_index(configs, data_dir, html_path, bundles=None):
+    """
+    Write each level's `data/levels/<level>.<hash>.json`, then
+    `data/index.<hash>.json`, and point index.html at the index.
+
+    Only a changed level gets a new file name, so the browser keeps its
+    cached copies of every other level. Difficulty is scored across all
+    levels, though, so a word list change can renumber other levels' tiers.
+
+    Args:
+        configs: Bee configs from levels.load_levels, in display order
+        data_dir: The data/ directory
+        html_path: index.html
+        bundles: Dict of level -> {"url", "ranges"} from audio_bundles.bundle_index
+
+    Returns:
+        Path of the index file.
+    """
+    # NumPy is only needed when the index is rebuilt
+    from word_difficulty import score_levels
+
+    bundles = bundles or {}
+    site_root = html_path.parent
+    level_dir = data_dir / LEVELS_DIR_NAME
+
+    level_words = {config['level']: read_words_json(config['json_file']) for config in configs}
+    scored = score_levels(level_words)
+
+    entries = []
+    for config in configs:
+        level = config['level']
+        words = level_words[level]
+        highlight_file = config.get('highlight_file')
+        highlights = read_words_json(highlight_file) if highlight_file and highlight_file.exists() else []
+        path = _write_hashed(render_level(words, highlights, bundles.get(level), scored[level]),
+                             level_dir, level)
+        entry = {
+            "id": level,
+            "title": config['title'],
+            "count": len(words),
+            "url": path.relative_to(site_root).as_posix(),
+        }
+        if config.get('variants'):
+            # Variant audio is fetched per word from audio/<level>/<variant>/
+            entry["variants"] = _variant_entries(config)
+        entries.append(entry)
+
+    # Word files of levels dropped from the registry
+    known = {entry['url'] for entry in entries}
+    for stale in level_dir.glob('*.json'):
+        if stale.relative_to(site_root).as_posix() not in known:
+            stale.unlink()
+
+    index_path = _write_hashed(render_index(entries), data_dir, 'index')
+
+    html = html_path.read_text(encoding='utf-8')
+    relative = index_path.relative_to(site_root).as_posix()
+    updated = META_PATTERN.sub(lambda m: m.group(1) + relative + m.group(3), html)
+    if updated != html:
+        # Renamed into place: watch mode rewrites it while the site is being served
+        tmp_path = html_path.with_name(html_path.name + '.tmp')
+        tmp_path.write_text(updated, encoding='utf-8')
+        os.replace(tmp_path, html_path)
+
+    return index_path
+
+
+def main():
+    """Rebuild the index from the existing data/words_<level>.json files."""
+    from audio_bundles import bundle_index, load_bundle_manifest
+    from levels import load_levels
+
+    project_root = Path(__file__).parent
+    bundles = bundle_index(load_bundle_manifest(project_root / 'audio' / 'bundles'))
+    index_path = write_word_index(load_levels(project_root), project_root / 'data',
+                                  project_root / 'index.html', bundles=bundles)
+    print(f"Wrote {index_path.relative_to(project_root)} ({index_path.stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    main()